@@ -1,55 +1,65 @@
 """Service for image clustering and similarity analysis"""
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import BallTree, NearestNeighbors
 from PIL import Image
 
 from ...domain.entities.image import Image as ImageEntity
-from ...domain.entities.image_hash import ImageHash
-from .image_hash_service import ImageHashService
+from ...domain.entities.image_hash import ImageHash, pairwise_hamming
+from .image_hash_service import ImageHashService, HashIndex, MIN_BAND_BITS, similarity_budget
 
 logger = logging.getLogger(__name__)
 
+# Largest collection for which DBSCAN neighborhoods come from a dense distance matrix
+DENSE_PAIRWISE_LIMIT = 4096
+
 class ClusterManager:
     """Manages image clustering and similarity analysis"""
     
     def __init__(self, 
                  hash_service: ImageHashService,
-                 eps: float = 0.3,
+                 eps: float = 0.15,
                  min_samples: int = 5):
         self.hash_service = hash_service
         self.eps = eps
         self.min_samples = min_samples
         self.logger = logging.getLogger(__name__)
         
-    def cluster_images(self, images: List[ImageEntity]) -> List['ImageCluster']:
-        """Cluster images based on perceptual hashes"""
+    def cluster_images(self,
+                       images: List[ImageEntity],
+                       subsample_ratio: float = 1.0,
+                       seed: Optional[int] = None) -> List['ImageCluster']:
+        """Cluster images based on perceptual hashes
+        
+        Args:
+            images: Images to cluster
+            subsample_ratio: Fraction of images considered as core-sample
+                candidates. Values below 1.0 switch to the DBSCAN++ path,
+                which keeps memory linear in the number of images.
+            seed: Optional seed for the core-candidate sampling
+        """
         try:
             if not images:
                 return []
                 
-            # Compute hashes for all images
-            image_hashes = []
-            valid_images = []
-            
-            for image in images:
-                if hash_data := self.hash_service.compute_perceptual_hash(image):
-                    image_hashes.append(hash_data.to_binary())
-                    valid_images.append(image)
+            # Compute hashes for all images in one batch
+            X, valid_images = self.hash_service._compute_phash_batch(images)
                     
             if not valid_images:
                 return []
                 
-            # Convert to numpy array and normalize
-            X = np.array(image_hashes)
-            X_scaled = StandardScaler().fit_transform(X)
+            # Hamming metrics operate on the raw hash bits
+            # (eps is the fraction of differing bits)
+            X = X.astype(np.uint8)
             
-            # Perform clustering
-            db = DBSCAN(eps=self.eps, min_samples=self.min_samples)
-            cluster_labels = db.fit_predict(X_scaled)
+            if int(len(X) * subsample_ratio) < len(X):
+                cluster_labels = self._subsampled_labels(X, subsample_ratio, seed)
+            else:
+                cluster_labels = self._dbscan_labels(X)
             
             # Group images by cluster
             clusters = {}
@@ -65,6 +75,150 @@ class ClusterManager:
             self.logger.error(f"Error clustering images: {e}")
             return []
             
+    def _dbscan_labels(self, X: np.ndarray) -> np.ndarray:
+        """Run DBSCAN over a sparse Hamming radius graph"""
+        if len(X) <= DENSE_PAIRWISE_LIMIT:
+            # Small enough to threshold a full popcount distance matrix;
+            # only the surviving entries are scaled, in float32
+            bit_distances = pairwise_hamming(np.packbits(X, axis=1))
+            rows, cols = np.nonzero(bit_distances <= self.eps * X.shape[1])
+            distances = bit_distances[rows, cols].astype(np.float32) / np.float32(X.shape[1])
+            graph = csr_matrix((distances, (rows, cols)), shape=bit_distances.shape)
+        else:
+            neighbors = NearestNeighbors(
+                radius=self.eps,
+                metric='hamming',
+                algorithm='ball_tree',
+                n_jobs=-1
+            ).fit(X)
+            graph = neighbors.radius_neighbors_graph(X, mode='distance')
+        
+        # Perform clustering on the precomputed neighborhoods
+        db = DBSCAN(eps=self.eps, min_samples=self.min_samples, metric='precomputed')
+        return db.fit_predict(graph)
+        
+    def _subsampled_labels(self, X: np.ndarray, ratio: float, seed: Optional[int]) -> np.ndarray:
+        """DBSCAN++: find core points among a random subset, then assign the rest
+        
+        Only the sampled candidates run radius queries, so memory grows with
+        N * ratio neighborhoods instead of N.
+        """
+        n = len(X)
+        k = max(1, int(n * ratio))
+        sample = np.random.default_rng(seed).choice(n, k, replace=False)
+        
+        # Radius neighborhoods of the sampled candidates against all points
+        tree = BallTree(X, metric='hamming')
+        neighborhoods = tree.query_radius(X[sample], r=self.eps)
+        
+        is_core = np.zeros(n, dtype=bool)
+        for idx, neighborhood in zip(sample, neighborhoods):
+            if len(neighborhood) >= self.min_samples:
+                is_core[idx] = True
+                
+        labels = np.full(n, -1, dtype=np.intp)
+        core_points = np.flatnonzero(is_core)
+        if not len(core_points):
+            return labels
+            
+        # Union-find over core-core edges within radius
+        parent = {int(idx): int(idx) for idx in core_points}
+        
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+            
+        for idx, neighborhood in zip(sample, neighborhoods):
+            if not is_core[idx]:
+                continue
+            root = find(int(idx))
+            for other in neighborhood[is_core[neighborhood]]:
+                other_root = find(int(other))
+                if other_root != root:
+                    parent[other_root] = root
+                    
+        roots = np.array([find(int(idx)) for idx in core_points])
+        _, core_labels = np.unique(roots, return_inverse=True)
+        
+        # Assign every point to the cluster of its nearest core sample,
+        # leaving points farther than eps from any core as noise
+        core_tree = BallTree(X[core_points], metric='hamming')
+        dist, nearest = core_tree.query(X, k=1)
+        within = dist[:, 0] <= self.eps
+        labels[within] = core_labels[nearest[within, 0]]
+        return labels
+            
+    def analyze_duplicates(self, 
+                         images: List[ImageEntity],
+                         threshold: float = 0.95) -> List[List[ImageEntity]]:
+        """Find duplicate or near-duplicate images"""
+        try:
+            # Calculate hashes for all images
+            hashed = []
+            for image in images:
+                if hash_data := self.hash_service.compute_average_hash(image):
+                    hashed.append((image, hash_data))
+                    
+            if not hashed:
+                return []
+                
+            # Largest Hamming distance that still meets the similarity threshold
+            hash_bits = hashed[0][1].hash_bits
+            budget = similarity_budget(hash_bits, threshold)
+            if budget < 0:
+                return []
+                
+            if hash_bits // (budget + 1) >= MIN_BAND_BITS:
+                neighbors = self._band_neighbors([h.packed for _, h in hashed], hash_bits, budget)
+            else:
+                # Bands would be too narrow to prune anything
+                distances = ImageHash.pairwise_distance_matrix([h for _, h in hashed])
+                neighbors = self._dense_neighbors(distances, budget)
+                
+            # Find groups of similar images
+            duplicate_groups = []
+            processed = [False] * len(hashed)
+            
+            for idx, image_neighbors in enumerate(neighbors):
+                if processed[idx]:
+                    continue
+                    
+                members = [j for j in image_neighbors if not processed[j]]
+                if members:
+                    duplicate_groups.append([hashed[idx][0]] + [hashed[j][0] for j in members])
+                    processed[idx] = True
+                    for j in members:
+                        processed[j] = True
+                        
+            return duplicate_groups
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing duplicates: {e}")
+            return []
+            
+    @staticmethod
+    def _band_neighbors(packed: List[int], hash_bits: int, budget: int) -> List[List[int]]:
+        """Find neighbors within budget by bucketing hashes on bands"""
+        index = HashIndex(hash_bits, budget)
+        for value in packed:
+            index.add(value)
+            
+        return [
+            [j for j in index.query(value) if j != idx]
+            for idx, value in enumerate(packed)
+        ]
+        
+    @staticmethod
+    def _dense_neighbors(distances: np.ndarray, budget: int) -> List[List[int]]:
+        """Find neighbors within budget from a full distance matrix"""
+        neighbors = [[] for _ in range(len(distances))]
+        for i, j in np.argwhere(distances <= budget):
+            if i != j:
+                neighbors[i].append(int(j))
+        return neighbors
+        
     def find_similar_images(self, 
                           target: ImageEntity,
                           candidates: List[ImageEntity],
@@ -103,41 +257,3 @@ class ImageCluster:
     def representative_image(self) -> Optional[ImageEntity]:
         """Get a representative image for the cluster"""
         return self.images[0] if self.images else None
-
-    def analyze_duplicates(self, 
-                         images: List[ImageEntity],
-                         threshold: float = 0.95) -> List[List[ImageEntity]]:
-        """Find duplicate or near-duplicate images"""
-        try:
-            # Calculate hashes for all images
-            image_hashes = {}
-            
-            for image in images:
-                if hash_data := self.hash_service.compute_average_hash(image):
-                    image_hashes[image] = hash_data
-                    
-            # Find groups of similar images
-            duplicate_groups = []
-            processed = set()
-            
-            for image1, hash1 in image_hashes.items():
-                if image1 in processed:
-                    continue
-                    
-                group = [image1]
-                
-                for image2, hash2 in image_hashes.items():
-                    if image1 != image2 and image2 not in processed:
-                        similarity = hash1.similarity(hash2)
-                        if similarity >= threshold:
-                            group.append(image2)
-                            
-                if len(group) > 1:
-                    duplicate_groups.append(group)
-                    processed.update(group)
-                    
-            return duplicate_groups
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing duplicates: {e}")
-            return [] 
\ No newline at end of file
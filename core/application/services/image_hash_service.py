@@ -1,45 +1,146 @@
 """Service for generating and comparing image hashes"""
 
+import io
+import os
 import logging
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
 from typing import Optional, List, Dict, Tuple
 import numpy as np
-from scipy.fftpack import dct
+from PIL import Image
 
 from core.domain.entities.image import Image as ImageEntity
 from core.domain.entities.image_hash import ImageHash
-from core.infrastructure.utils.image_utils import open_image_efficient
+from core.infrastructure.utils.image_utils import open_image_efficient, convert_to_rgb
+from core.infrastructure.utils.file_utils import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Edge length of the grayscale image every hash type is derived from
+HASH_SOURCE_SIZE = 32
+
+# Hash types supported by find_similar_images
+HASH_TYPES = ('average', 'perceptual', 'difference')
+
+# Narrowest band for which bucketing still beats a linear scan
+MIN_BAND_BITS = 8
+
+# Batches larger than this use the CUDA pHash path when torch and a GPU are available
+CUDA_BATCH_THRESHOLD = 4096
+
+# ITU-R 601-2 luma weights (the same transform as PIL's convert('L'))
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def to_luma(rgb: np.ndarray) -> np.ndarray:
+    """Convert uint8 RGB pixels of shape (..., 3) to float32 luma"""
+    return rgb.astype(np.float32) @ LUMA_WEIGHTS
+
+def dct_basis(size: int, rows: int) -> np.ndarray:
+    """Build the first rows of the orthonormal DCT-II matrix
+    
+    B @ X @ B.T gives the top-left rows x rows block of the 2D DCT of X,
+    without computing the coefficients the hash discards.
+    """
+    k = np.arange(rows)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+def similarity_budget(hash_bits: int, threshold: float) -> int:
+    """Largest Hamming distance that still meets a similarity threshold, or -1"""
+    return max(
+        (d for d in range(hash_bits + 1) if 1.0 - d / hash_bits >= threshold),
+        default=-1
+    )
+
+def hash_bands(hash_bits: int, num_bands: int) -> List[Tuple[int, int]]:
+    """Split hash bits into contiguous bands, returned as (shift, mask) pairs"""
+    num_bands = min(num_bands, hash_bits)
+    width = hash_bits // num_bands
+    bands = []
+    for band in range(num_bands):
+        # The last band absorbs any leftover bits
+        band_width = width if band < num_bands - 1 else hash_bits - band * width
+        bands.append((band * width, (1 << band_width) - 1))
+    return bands
+
+def _mtime_ns(path: str) -> int:
+    """Modification time of a file, or -1 if it cannot be read"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+class HashIndex:
+    """Band-bucketed index of packed hashes for sub-linear Hamming lookups
+    
+    With max_distance + 1 bands, any hash within max_distance of a query
+    agrees exactly with it on at least one band (pigeonhole), so only
+    bucket collisions need verifying and there are no false negatives.
+    """
+    
+    def __init__(self, hash_bits: int, max_distance: int):
+        self.max_distance = max_distance
+        self.bands = hash_bands(hash_bits, max_distance + 1)
+        self.buckets = [defaultdict(list) for _ in self.bands]
+        self.hashes: List[int] = []
+        
+    def __len__(self) -> int:
+        return len(self.hashes)
+        
+    def add(self, packed: int) -> int:
+        """Add a packed hash and return its index"""
+        idx = len(self.hashes)
+        self.hashes.append(packed)
+        for bucket, (shift, mask) in zip(self.buckets, self.bands):
+            bucket[(packed >> shift) & mask].append(idx)
+        return idx
+        
+    def query(self, packed: int) -> List[int]:
+        """Get indices of all hashes within max_distance of a packed hash"""
+        candidates = set()
+        for bucket, (shift, mask) in zip(self.buckets, self.bands):
+            candidates.update(bucket.get((packed >> shift) & mask, ()))
+        return sorted(
+            idx for idx in candidates
+            if (packed ^ self.hashes[idx]).bit_count() <= self.max_distance
+        )
+
 class ImageHashService:
     """Service for generating and comparing perceptual image hashes"""
     
-    def __init__(self, hash_size: int = 8):
+    def __init__(self, hash_size: int = 8, cache_dir: Optional[Path] = None, cache_size: int = 16384):
+        """
+        Initialize hash service
+        
+        Args:
+            hash_size: Edge length of the square hashes
+            cache_dir: Optional directory to persist computed hashes across runs
+            cache_size: Maximum number of images kept in the hash cache
+        """
         self.hash_size = hash_size
         self.logger = logging.getLogger(__name__)
         
+        # Low-frequency DCT basis for pHash, shape (hash_size, 32)
+        self.dct_basis = dct_basis(HASH_SOURCE_SIZE, hash_size)
+        
+        # LRU of all three hashes keyed by (path, mtime_ns), so edited files rehash
+        self.cache_size = cache_size
+        self.hash_cache: OrderedDict[Tuple[str, int], Dict[str, ImageHash]] = OrderedDict()
+        self.hash_cache_lock = Lock()
+        self.cache_file = Path(cache_dir) / f"hashes_{hash_size}.npz" if cache_dir else None
+        self._load_cache()
+        
+        # Band index over the last candidate list passed to find_similar_images
+        self._similarity_index: Optional[Tuple[tuple, HashIndex, List[ImageEntity]]] = None
+        
     def compute_average_hash(self, image: ImageEntity) -> Optional[ImageHash]:
         """Compute average hash (aHash) for an image"""
         try:
-            # Open image efficiently and convert to grayscale
-            if img := open_image_efficient(image.path, (self.hash_size, self.hash_size)):
-                with img:
-                    # Convert to grayscale and resize
-                    img = img.convert('L')
-                    
-                    # Get pixel data
-                    pixels = np.array(img)
-                    
-                    # Compute average and generate hash
-                    avg = pixels.mean()
-                    hash_array = pixels > avg
-                    
-                    return ImageHash(
-                        hash_array=hash_array,
-                        hash_size=self.hash_size,
-                        hash_type='average'
-                    )
-                    
+            return self._cached_hashes(image.path).get('average')
         except Exception as e:
             self.logger.error(f"Error computing average hash for {image.path}: {e}")
             return None
@@ -47,31 +148,7 @@ class ImageHashService:
     def compute_perceptual_hash(self, image: ImageEntity) -> Optional[ImageHash]:
         """Compute perceptual hash (pHash) for an image"""
         try:
-            # Open image efficiently and convert to grayscale
-            if img := open_image_efficient(image.path, (32, 32)):
-                with img:
-                    # Convert to grayscale
-                    img = img.convert('L')
-                    
-                    # Get pixel data
-                    pixels = np.array(img, dtype=float)
-                    
-                    # Compute DCT
-                    dct_result = dct(dct(pixels.T, norm='ortho').T, norm='ortho')
-                    
-                    # Keep top-left 8x8 of DCT
-                    dct_low = dct_result[:self.hash_size, :self.hash_size]
-                    
-                    # Compute median and generate hash
-                    med = np.median(dct_low)
-                    hash_array = dct_low > med
-                    
-                    return ImageHash(
-                        hash_array=hash_array,
-                        hash_size=self.hash_size,
-                        hash_type='perceptual'
-                    )
-                    
+            return self._cached_hashes(image.path).get('perceptual')
         except Exception as e:
             self.logger.error(f"Error computing perceptual hash for {image.path}: {e}")
             return None
@@ -79,28 +156,218 @@ class ImageHashService:
     def compute_difference_hash(self, image: ImageEntity) -> Optional[ImageHash]:
         """Compute difference hash (dHash) for an image"""
         try:
-            # Open image efficiently and convert to grayscale
-            if img := open_image_efficient(image.path, (self.hash_size + 1, self.hash_size)):
-                with img:
-                    # Convert to grayscale
-                    img = img.convert('L')
+            return self._cached_hashes(image.path).get('difference')
+        except Exception as e:
+            self.logger.error(f"Error computing difference hash for {image.path}: {e}")
+            return None
+            
+    def compute_all_hashes(self, image: ImageEntity) -> Dict[str, ImageHash]:
+        """Compute average, perceptual and difference hashes from a single decode"""
+        try:
+            return dict(self._cached_hashes(image.path))
+        except Exception as e:
+            self.logger.error(f"Error computing hashes for {image.path}: {e}")
+            return {}
+            
+    def _cached_hashes(self, path: str) -> Dict[str, ImageHash]:
+        """Get all hashes for a path from the cache, computing them on a miss"""
+        key = (path, os.stat(path).st_mtime_ns)
+        with self.hash_cache_lock:
+            if (hashes := self.hash_cache.get(key)) is not None:
+                self.hash_cache.move_to_end(key)
+                return hashes
+                
+        pixels = self._load_grayscale(path)
+        if pixels is None:
+            return {}
+            
+        hashes = {
+            'average': self._average_hash(pixels),
+            'perceptual': self._perceptual_hash(pixels),
+            'difference': self._difference_hash(pixels)
+        }
+        with self.hash_cache_lock:
+            self.hash_cache[key] = hashes
+            while len(self.hash_cache) > self.cache_size:
+                self.hash_cache.popitem(last=False)
+        return hashes
+        
+    def _load_cache(self) -> None:
+        """Load persisted hashes from disk"""
+        try:
+            if self.cache_file:
+                # Pickled caches from older versions are not trusted; rehash instead
+                self.cache_file.with_suffix('.pkl').unlink(missing_ok=True)
+                
+            if self.cache_file and self.cache_file.exists():
+                with np.load(self.cache_file, allow_pickle=False) as data:
+                    paths, mtimes = data['paths'], data['mtimes']
+                    packed = {hash_type: data[hash_type] for hash_type in HASH_TYPES}
                     
-                    # Get pixel data
-                    pixels = np.array(img)
+                bits = self.hash_size * self.hash_size
+                shape = (self.hash_size, self.hash_size)
+                for idx, key in enumerate(zip(paths.tolist(), mtimes.tolist())):
+                    hashes = {}
+                    for hash_type in HASH_TYPES:
+                        row = packed[hash_type][idx]
+                        hashes[hash_type] = ImageHash(
+                            hash_array=np.unpackbits(row)[:bits].reshape(shape).astype(bool),
+                            hash_size=self.hash_size,
+                            hash_type=hash_type,
+                            packed=int.from_bytes(row.tobytes(), 'little')
+                        )
+                    self.hash_cache[key] = hashes
                     
-                    # Compute differences
-                    diff = pixels[:, 1:] > pixels[:, :-1]
+                while len(self.hash_cache) > self.cache_size:
+                    self.hash_cache.popitem(last=False)
+        except Exception as e:
+            self.logger.error(f"Error loading hash cache: {e}")
+            self.hash_cache.clear()
+            
+    def save_cache(self) -> None:
+        """Persist cached hashes to disk
+        
+        Stored as numpy arrays (paths, mtimes and the packed bits of each
+        hash type) and written atomically, so a crash mid-save leaves the
+        previous cache intact.
+        """
+        try:
+            if self.cache_file:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with self.hash_cache_lock:
+                    items = list(self.hash_cache.items())
                     
-                    return ImageHash(
-                        hash_array=diff,
-                        hash_size=self.hash_size,
-                        hash_type='difference'
-                    )
+                arrays = {
+                    'paths': np.array([path for (path, _), _ in items], dtype=str),
+                    'mtimes': np.array([mtime for (_, mtime), _ in items], dtype=np.int64),
+                }
+                nbytes = (self.hash_size * self.hash_size + 7) // 8
+                for hash_type in HASH_TYPES:
+                    arrays[hash_type] = np.array(
+                        [np.packbits(hashes[hash_type].hash_array.ravel()) for _, hashes in items],
+                        dtype=np.uint8
+                    ).reshape(len(items), nbytes)
                     
+                buffer = io.BytesIO()
+                np.savez(buffer, **arrays)
+                atomic_write_bytes(self.cache_file, buffer.getvalue())
         except Exception as e:
-            self.logger.error(f"Error computing difference hash for {image.path}: {e}")
+            self.logger.error(f"Error saving hash cache: {e}")
+            
+    def cleanup(self) -> None:
+        """Clean up resources"""
+        self.save_cache()
+            
+    def _load_grayscale(self, path: str) -> Optional[np.ndarray]:
+        """Decode an image once into the small float32 luma array all hashes derive from"""
+        size = (HASH_SOURCE_SIZE, HASH_SOURCE_SIZE)
+        try:
+            if img := open_image_efficient(path, size, mode='L'):
+                with img:
+                    if img.mode == 'L':
+                        # JPEGs decode straight to their luma plane
+                        gray = img.resize(size, Image.Resampling.LANCZOS)
+                        return np.asarray(gray, dtype=np.float32)
+                        
+                    rgb = convert_to_rgb(img).resize(size, Image.Resampling.LANCZOS)
+                    return to_luma(np.asarray(rgb))
+        except Exception as e:
+            self.logger.error(f"Error loading pixels for {path}: {e}")
+        return None
+        
+    def _average_hash(self, pixels: np.ndarray) -> ImageHash:
+        """Derive aHash by downsampling the grayscale source to hash_size"""
+        factor, remainder = divmod(HASH_SOURCE_SIZE, self.hash_size)
+        if remainder:
+            small = Image.fromarray(pixels, mode='F').resize(
+                (self.hash_size, self.hash_size), Image.Resampling.BOX
+            )
+            pixels = np.asarray(small)
+        else:
+            # Exact mean-pooling of factor x factor blocks
+            pixels = pixels.reshape(
+                self.hash_size, factor, self.hash_size, factor
+            ).mean(axis=(1, 3))
+            
+        # Compute average and generate hash
+        return ImageHash(
+            hash_array=pixels > pixels.mean(),
+            hash_size=self.hash_size,
+            hash_type='average'
+        )
+        
+    def _perceptual_hash(self, pixels: np.ndarray) -> ImageHash:
+        """Derive pHash from the DCT of the grayscale source pixels"""
+        # Project onto the low-frequency DCT basis (top-left 8x8 of the 2D DCT)
+        dct_low = self.dct_basis @ pixels @ self.dct_basis.T
+        
+        # Compute median and generate hash
+        return ImageHash(
+            hash_array=dct_low > np.median(dct_low),
+            hash_size=self.hash_size,
+            hash_type='perceptual'
+        )
+        
+    def _difference_hash(self, pixels: np.ndarray) -> ImageHash:
+        """Derive dHash from horizontal gradients of the grayscale source"""
+        small = Image.fromarray(pixels, mode='F').resize(
+            (self.hash_size + 1, self.hash_size), Image.Resampling.BILINEAR
+        )
+        pixels = np.asarray(small)
+        
+        # Compute differences
+        return ImageHash(
+            hash_array=pixels[:, 1:] > pixels[:, :-1],
+            hash_size=self.hash_size,
+            hash_type='difference'
+        )
+        
+    def _compute_phash_batch(self, images: List[ImageEntity]) -> Tuple[np.ndarray, List[ImageEntity]]:
+        """Compute perceptual hash bits for many images at once
+        
+        Images are decoded in parallel (PIL releases the GIL while decoding)
+        and the DCTs for the whole batch are computed in a single vectorized
+        call over an (N, 32, 32) stack.
+        
+        Returns:
+            Tuple of (bool array of shape (N, hash_size**2), images that were hashed)
+        """
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            pixels = list(executor.map(lambda image: self._load_grayscale(image.path), images))
+            
+        valid = [(image, px) for image, px in zip(images, pixels) if px is not None]
+        if not valid:
+            return np.empty((0, self.hash_size * self.hash_size), dtype=bool), []
+            
+        # Stack into one (N, 32, 32) tensor; very large batches go to the GPU
+        stack = np.stack([px for _, px in valid])
+        valid_images = [image for image, _ in valid]
+        if len(valid) > CUDA_BATCH_THRESHOLD:
+            hash_bits = self._phash_bits_cuda(stack)
+            if hash_bits is not None:
+                return hash_bits, valid_images
+                
+        # Low-frequency DCT block of every image in one batched GEMM,
+        # thresholded against each hash's own median
+        dct_low = self.dct_basis @ stack @ self.dct_basis.T
+        hash_bits = dct_low > np.median(dct_low, axis=(1, 2), keepdims=True)
+        
+        return hash_bits.reshape(len(valid), -1), valid_images
+        
+    def _phash_bits_cuda(self, stack: np.ndarray) -> Optional[np.ndarray]:
+        """Compute pHash bits on the GPU, or None when CUDA is unavailable"""
+        try:
+            from core.infrastructure.utils.hash_cuda import cuda_available, phash_bits
+        except ImportError:
             return None
             
+        try:
+            if cuda_available():
+                return phash_bits(stack, self.dct_basis)
+        except Exception as e:
+            self.logger.error(f"Error computing hashes on CUDA, falling back to CPU: {e}")
+        return None
+            
     def find_similar_images(self, 
                           target: ImageEntity,
                           candidates: List[ImageEntity],
@@ -108,35 +375,77 @@ class ImageHashService:
                           hash_type: str = 'average') -> List[Tuple[ImageEntity, float]]:
         """Find similar images based on hash comparison"""
         try:
-            # Get hash function based on type
-            hash_func = {
-                'average': self.compute_average_hash,
-                'perceptual': self.compute_perceptual_hash,
-                'difference': self.compute_difference_hash
-            }.get(hash_type)
-            
-            if not hash_func:
+            if hash_type not in HASH_TYPES:
                 raise ValueError(f"Invalid hash type: {hash_type}")
                 
             # Compute target hash
-            target_hash = hash_func(target)
+            target_hash = self.compute_all_hashes(target).get(hash_type)
             if not target_hash:
                 return []
                 
-            # Compare with candidates
+            # Largest bit distance that still meets the threshold
+            hash_bits = target_hash.hash_bits
+            budget = similarity_budget(hash_bits, threshold)
+            if budget < 0:
+                return []
+                
+            if hash_bits // (budget + 1) < MIN_BAND_BITS:
+                # Bands would be too narrow to prune anything
+                return self._scan_similar(target, target_hash, candidates, threshold, hash_type)
+                
+            index, indexed = self._get_similarity_index(candidates, hash_type, hash_bits, budget)
             similar_images = []
-            for candidate in candidates:
-                if candidate.path == target.path:
-                    continue
+            for idx in index.query(target_hash.packed):
+                candidate = indexed[idx]
+                if candidate.path != target.path:
+                    distance = (target_hash.packed ^ index.hashes[idx]).bit_count()
+                    similar_images.append((candidate, 1.0 - distance / hash_bits))
                     
-                candidate_hash = hash_func(candidate)
-                if candidate_hash:
-                    similarity = target_hash.similarity(candidate_hash)
-                    if similarity >= threshold:
-                        similar_images.append((candidate, similarity))
-                        
             return sorted(similar_images, key=lambda x: x[1], reverse=True)
             
         except Exception as e:
             self.logger.error(f"Error finding similar images: {e}")
-            return [] 
\ No newline at end of file
+            return []
+            
+    def _get_similarity_index(self,
+                              candidates: List[ImageEntity],
+                              hash_type: str,
+                              hash_bits: int,
+                              budget: int) -> Tuple[HashIndex, List[ImageEntity]]:
+        """Get the band index for a candidate list, reusing it while the list
+        and the candidate files are unchanged"""
+        # Same (path, mtime) pairs the hash cache is keyed by
+        key = (hash_type, budget, tuple((candidate.path, _mtime_ns(candidate.path)) for candidate in candidates))
+        if self._similarity_index and self._similarity_index[0] == key:
+            return self._similarity_index[1], self._similarity_index[2]
+            
+        index = HashIndex(hash_bits, budget)
+        indexed = []
+        for candidate in candidates:
+            candidate_hash = self.compute_all_hashes(candidate).get(hash_type)
+            if candidate_hash and candidate_hash.hash_bits == hash_bits:
+                index.add(candidate_hash.packed)
+                indexed.append(candidate)
+                
+        self._similarity_index = (key, index, indexed)
+        return index, indexed
+        
+    def _scan_similar(self,
+                      target: ImageEntity,
+                      target_hash: ImageHash,
+                      candidates: List[ImageEntity],
+                      threshold: float,
+                      hash_type: str) -> List[Tuple[ImageEntity, float]]:
+        """Compare the target against every candidate"""
+        similar_images = []
+        for candidate in candidates:
+            if candidate.path == target.path:
+                continue
+                
+            candidate_hash = self.compute_all_hashes(candidate).get(hash_type)
+            if candidate_hash:
+                similarity = target_hash.similarity(candidate_hash)
+                if similarity >= threshold:
+                    similar_images.append((candidate, similarity))
+                    
+        return sorted(similar_images, key=lambda x: x[1], reverse=True)
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any, Set
 import logging
+from collections import deque
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtGui import QImage
@@ -39,11 +40,18 @@ class ImageLoaderService(QObject):
             name="ThumbnailProcessor"
         )
         
+        # Page-cache prefetch runs off the GUI thread
+        self.prefetch_worker = WorkerPool(
+            process_func=self.thumbnail_cache.prefetch,
+            num_workers=1,
+            name="ThumbnailPrefetch"
+        )
+        
         # Connect to thumbnail cache signals
         self.thumbnail_cache.thumbnail_ready.connect(self._on_thumbnail_ready)
         
         # Initialize state
-        self._pending_images = []
+        self._pending_images = deque()
         self._batch_size = 50
         self._is_loading = False
         
@@ -62,7 +70,7 @@ class ImageLoaderService(QObject):
         try:
             self._batch_size = batch_size
             self._is_loading = True
-            self._pending_images = []
+            self._pending_images = deque()
             
             # Queue directory loading
             self.directory_worker.put((directory_path, include_subfolders))
@@ -89,7 +97,7 @@ class ImageLoaderService(QObject):
                 return
                 
             # Store pending images and start batch processing
-            self._pending_images = list(images)
+            self._pending_images = deque(images)
             self._process_next_batch()
             
         except Exception as e:
@@ -99,28 +107,24 @@ class ImageLoaderService(QObject):
             self._is_loading = False
             
     def _process_next_batch(self) -> None:
-        """Process next batch of pending images"""
+        """Process pending images batch by batch"""
         try:
-            if not self._pending_images:
-                return
+            while self._pending_images:
+                # Get next batch
+                batch = [
+                    self._pending_images.popleft()
+                    for _ in range(min(self._batch_size, len(self._pending_images)))
+                ]
                 
-            # Get next batch
-            batch = self._pending_images[:self._batch_size]
-            self._pending_images = self._pending_images[self._batch_size:]
-            
-            # Queue batch processing
-            self.thumbnail_worker.put(batch)
-            
-            # Update progress
-            total = len(batch) + len(self._pending_images)
-            self.loading_progress.emit(len(batch), total)
-            
-            # Emit batch
-            self.thumbnail_batch_ready.emit(batch)
-            
-            # Continue processing if more pending
-            if self._pending_images:
-                self._process_next_batch()
+                # Queue batch processing
+                self.thumbnail_worker.put(batch)
+                
+                # Update progress
+                total = len(batch) + len(self._pending_images)
+                self.loading_progress.emit(len(batch), total)
+                
+                # Emit batch
+                self.thumbnail_batch_ready.emit(batch)
                 
         except Exception as e:
             logger.error(f"Error processing batch: {e}")
@@ -128,18 +132,18 @@ class ImageLoaderService(QObject):
     def _process_thumbnail_batch(self, images: List[Image]) -> None:
         """Process a batch of images for thumbnails"""
         try:
+            # Look up the whole batch at once
+            cached = self.thumbnail_cache.get_many([image.path for image in images])
+            
+            # Emit immediately for cached images, queue the rest for generation
+            misses = []
             for image in images:
-                # Check if thumbnail exists in cache
-                if cached_image := self.thumbnail_cache.get_thumbnail(image.path):
-                    if isinstance(cached_image, QImage):
-                        # Emit immediately if we have a cached image
-                        self.thumbnail_ready.emit(image.path, cached_image)
-                    else:
-                        # Load from cached path
-                        self.thumbnail_cache.put(image.path, image.path)
+                if cached_image := cached.get(image.path):
+                    self.thumbnail_ready.emit(image.path, cached_image)
                 else:
-                    # Queue for generation
-                    self.thumbnail_cache.put(image.path, image.path)
+                    misses.append(image.path)
+                    
+            self.thumbnail_cache.put_many(misses)
         except Exception as e:
             logger.error(f"Error processing thumbnail batch: {e}")
 
@@ -148,6 +152,7 @@ class ImageLoaderService(QObject):
         try:
             self.directory_worker.cleanup()
             self.thumbnail_worker.cleanup()
+            self.prefetch_worker.cleanup()
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
@@ -196,8 +201,17 @@ class ImageLoaderService(QObject):
             
     def batch_generate_thumbnails(self, image_paths: List[str], priority: bool = False) -> None:
         """Generate thumbnails for multiple images"""
-        for path in image_paths:
-            self.generate_thumbnail(path, priority)
+        try:
+            self.thumbnail_cache.put_many(image_paths, priority)
+        except Exception as e:
+            logger.error(f"Error generating thumbnails: {e}")
+            
+    def prefetch_thumbnails(self, image_paths: List[str]) -> None:
+        """Queue warming the OS page cache for thumbnails about to be shown"""
+        try:
+            self.prefetch_worker.put(list(image_paths))
+        except Exception as e:
+            logger.error(f"Error prefetching thumbnails: {e}")
             
     def clear_cache(self) -> None:
         """Clear the thumbnail cache"""
@@ -1,8 +1,16 @@
 """Service for handling image transformations"""
 
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
+import numpy as np
+from PIL import Image, ImageEnhance
+
+try:
+    import cv2
+except ImportError:  # Optional; geometry falls back to Pillow
+    cv2 = None
 
 from ...domain.entities.image import Image as ImageEntity
 from ...infrastructure.config.app_config import AppConfig
@@ -10,105 +18,154 @@ from ...infrastructure.utils.image_utils import open_image_efficient, save_image
 
 logger = logging.getLogger(__name__)
 
+# Pillow modes that map losslessly to uint8 arrays OpenCV understands
+ARRAY_MODES = ('L', 'RGB', 'RGBA')
+
+# Transpose operations for TransformSpec.flip
+FLIP_TRANSPOSES = {
+    'horizontal': Image.Transpose.FLIP_LEFT_RIGHT,
+    'vertical': Image.Transpose.FLIP_TOP_BOTTOM
+}
+
+@dataclass
+class TransformSpec:
+    """Set of transformations applied together in a single decode/encode pass
+    
+    Operations run in a fixed order: crop, rotate, resize, flip, enhance.
+    """
+    
+    rotate: int = 0  # Degrees counter-clockwise
+    flip: Optional[str] = None  # 'horizontal' or 'vertical'
+    crop: Optional[Tuple[int, int, int, int]] = None  # (left, top, right, bottom)
+    resize: Optional[Tuple[int, int]] = None
+    maintain_aspect: bool = True  # Fit within resize instead of stretching to it
+    brightness: float = 1.0
+    contrast: float = 1.0
+    saturation: float = 1.0
+
 class ImageTransformService:
     """Service for handling image transformations"""
     
     def __init__(self, config: AppConfig):
         self.config = config
         
-    def rotate_image(self, image: ImageEntity, degrees: int) -> bool:
-        """Rotate an image by the specified degrees"""
+    def apply(self, image: ImageEntity, spec: TransformSpec) -> bool:
+        """Apply a set of transformations with a single open and save"""
         try:
             if img := open_image_efficient(image.path):
                 with img:
-                    # Rotate image
-                    rotated = img.rotate(degrees, expand=True)
+                    transformed = self._apply_spec(img, spec)
                     
-                    # Save rotated image
-                    if save_image_optimized(rotated, image.path):
+                    # Save transformed image
+                    if save_image_optimized(transformed, image.path):
                         # Update image metadata
-                        image.metadata.width = rotated.width
-                        image.metadata.height = rotated.height
+                        image.metadata.width = transformed.width
+                        image.metadata.height = transformed.height
                         return True
                         
             return False
                 
         except Exception as e:
-            logger.error(f"Error rotating image {image.path}: {e}")
+            logger.error(f"Error transforming image {image.path}: {e}")
             return False
             
+    @staticmethod
+    def _apply_spec(img: Image.Image, spec: TransformSpec) -> Image.Image:
+        """Apply the operations in a spec to an open image"""
+        if spec.crop:
+            img = img.crop(spec.crop)
+            
+        if spec.rotate or spec.resize or spec.flip:
+            if cv2 is not None and img.mode in ARRAY_MODES:
+                img = ImageTransformService._transform_array(img, spec)
+            else:
+                img = ImageTransformService._transform_pil(img, spec)
+            
+        # Apply adjustments
+        if spec.brightness != 1.0:
+            img = ImageEnhance.Brightness(img).enhance(spec.brightness)
+        if spec.contrast != 1.0:
+            img = ImageEnhance.Contrast(img).enhance(spec.contrast)
+        if spec.saturation != 1.0:
+            img = ImageEnhance.Color(img).enhance(spec.saturation)
+            
+        return img
+        
+    @staticmethod
+    def _transform_pil(img: Image.Image, spec: TransformSpec) -> Image.Image:
+        """Rotate, resize and flip with Pillow"""
+        if spec.rotate:
+            img = img.rotate(spec.rotate, expand=True)
+            
+        if spec.resize:
+            # Calculate new size if maintaining aspect ratio
+            if spec.maintain_aspect:
+                img.thumbnail(spec.resize, Image.Resampling.LANCZOS)
+            else:
+                img = img.resize(spec.resize, Image.Resampling.LANCZOS)
+                
+        if spec.flip:
+            img = img.transpose(FLIP_TRANSPOSES[spec.flip])
+            
+        return img
+        
+    @staticmethod
+    def _transform_array(img: Image.Image, spec: TransformSpec) -> Image.Image:
+        """Rotate, resize and flip as numpy/OpenCV array operations"""
+        arr = np.asarray(img)
+        
+        if spec.rotate % 90 == 0:
+            # Right-angle rotations are a stride-only view
+            arr = np.ascontiguousarray(np.rot90(arr, k=(spec.rotate // 90) % 4))
+        else:
+            # Rotate counter-clockwise about the center, expanding to fit
+            height, width = arr.shape[:2]
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), spec.rotate, 1.0)
+            cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+            new_width = int(round(height * sin + width * cos))
+            new_height = int(round(height * cos + width * sin))
+            matrix[0, 2] += (new_width - width) / 2
+            matrix[1, 2] += (new_height - height) / 2
+            arr = cv2.warpAffine(arr, matrix, (new_width, new_height), flags=cv2.INTER_NEAREST)
+            
+        if spec.resize:
+            height, width = arr.shape[:2]
+            size = spec.resize
+            if spec.maintain_aspect:
+                # Only shrink, fitting within the box like Image.thumbnail
+                scale = min(size[0] / width, size[1] / height, 1.0)
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            if size != (width, height):
+                # Lanczos in OpenCV does not antialias, so shrink with area averaging
+                shrinking = size[0] < width and size[1] < height
+                interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+                arr = cv2.resize(arr, size, interpolation=interpolation)
+                
+        if spec.flip:
+            arr = cv2.flip(arr, 1 if spec.flip == 'horizontal' else 0)
+            
+        return Image.fromarray(arr)
+        
+    def rotate_image(self, image: ImageEntity, degrees: int) -> bool:
+        """Rotate an image by the specified degrees"""
+        return self.apply(image, TransformSpec(rotate=degrees))
+            
     def mirror_image(self, image: ImageEntity, horizontal: bool = True) -> bool:
         """Mirror an image horizontally or vertically"""
-        try:
-            if img := open_image_efficient(image.path):
-                with img:
-                    # Mirror image
-                    from PIL import Image
-                    mirrored = img.transpose(
-                        Image.Transpose.FLIP_LEFT_RIGHT if horizontal 
-                        else Image.Transpose.FLIP_TOP_BOTTOM
-                    )
-                    
-                    # Save mirrored image
-                    return save_image_optimized(mirrored, image.path)
-                    
-            return False
-                
-        except Exception as e:
-            logger.error(f"Error mirroring image {image.path}: {e}")
-            return False
+        return self.apply(image, TransformSpec(flip='horizontal' if horizontal else 'vertical'))
             
     def resize_image(self, 
                     image: ImageEntity, 
                     size: Tuple[int, int],
                     maintain_aspect: bool = True) -> bool:
         """Resize an image to the specified dimensions"""
-        try:
-            if img := open_image_efficient(image.path):
-                with img:
-                    from PIL import Image
-                    # Calculate new size if maintaining aspect ratio
-                    if maintain_aspect:
-                        img.thumbnail(size, Image.Resampling.LANCZOS)
-                        resized = img
-                    else:
-                        resized = img.resize(size, Image.Resampling.LANCZOS)
-                    
-                    # Save resized image
-                    if save_image_optimized(resized, image.path):
-                        # Update image metadata
-                        image.metadata.width = resized.width
-                        image.metadata.height = resized.height
-                        return True
-                        
-            return False
-                
-        except Exception as e:
-            logger.error(f"Error resizing image {image.path}: {e}")
-            return False
+        return self.apply(image, TransformSpec(resize=size, maintain_aspect=maintain_aspect))
             
     def crop_image(self, 
                    image: ImageEntity, 
                    box: Tuple[int, int, int, int]) -> bool:
         """Crop an image to the specified box (left, top, right, bottom)"""
-        try:
-            if img := open_image_efficient(image.path):
-                with img:
-                    # Crop image
-                    cropped = img.crop(box)
-                    
-                    # Save cropped image
-                    if save_image_optimized(cropped, image.path):
-                        # Update image metadata
-                        image.metadata.width = cropped.width
-                        image.metadata.height = cropped.height
-                        return True
-                        
-            return False
-                
-        except Exception as e:
-            logger.error(f"Error cropping image {image.path}: {e}")
-            return False
+        return self.apply(image, TransformSpec(crop=box))
             
     def adjust_image(self, 
                     image: ImageEntity,
@@ -116,24 +173,8 @@ class ImageTransformService:
                     contrast: float = 1.0,
                     saturation: float = 1.0) -> bool:
         """Adjust image brightness, contrast, and saturation"""
-        try:
-            if img := open_image_efficient(image.path):
-                with img:
-                    from PIL import ImageEnhance
-                    
-                    # Apply adjustments
-                    if brightness != 1.0:
-                        img = ImageEnhance.Brightness(img).enhance(brightness)
-                    if contrast != 1.0:
-                        img = ImageEnhance.Contrast(img).enhance(contrast)
-                    if saturation != 1.0:
-                        img = ImageEnhance.Color(img).enhance(saturation)
-                    
-                    # Save adjusted image
-                    return save_image_optimized(img, image.path)
-                    
-            return False
-                
-        except Exception as e:
-            logger.error(f"Error adjusting image {image.path}: {e}")
-            return False 
\ No newline at end of file
+        return self.apply(image, TransformSpec(
+            brightness=brightness,
+            contrast=contrast,
+            saturation=saturation
+        ))
@@ -1,17 +1,24 @@
 """Service for managing image metadata"""
 
+import os
 import logging
 from typing import Dict, Any, Optional
-from pathlib import Path
 import json
+from PIL import Image
 
 from ...domain.entities.image import Image as ImageEntity
 from ...domain.entities.image_metadata import ImageMetadata
 from ...infrastructure.config.app_config import AppConfig
-from ...infrastructure.utils.image_utils import open_image_efficient, save_image_optimized
+from ...infrastructure.utils.image_utils import open_image_efficient, save_image_optimized, rewrite_png_text_chunk
+from ...infrastructure.utils.json_utils import json_loads
 
 logger = logging.getLogger(__name__)
 
+def _cache_key(path: str, stats: Optional[os.stat_result] = None) -> str:
+    """Build a metadata cache key that changes whenever the file does"""
+    stats = stats or os.stat(path)
+    return f"{path}|{stats.st_mtime_ns}|{stats.st_size}"
+
 class MetadataService:
     """Service for managing image metadata"""
     
@@ -21,35 +28,40 @@ class MetadataService:
     def get_metadata(self, image: ImageEntity) -> Dict[str, Any]:
         """Get metadata for an image"""
         try:
-            # Return cached metadata if available
-            if cached := self.config.metadata_cache.get(image.path):
+            # Return cached metadata if the file is unchanged
+            stats = os.stat(image.path)
+            cache_key = _cache_key(image.path, stats)
+            if cached := self.config.metadata_cache.get(cache_key):
                 return cached
                 
-            # Extract metadata from image
-            if img := open_image_efficient(image.path):
-                with img:
-                    metadata = {
-                        'width': img.width,
-                        'height': img.height,
-                        'format': img.format,
-                        'mode': img.mode,
-                        'size': Path(image.path).stat().st_size
-                    }
-                    
-                    # Extract InvokeAI metadata if available
-                    if 'invokeai_metadata' in img.info:
-                        try:
-                            invoke_metadata = json.loads(img.info['invokeai_metadata'])
-                            metadata.update(invoke_metadata)
-                        except Exception as e:
-                            logger.debug(f"Error parsing InvokeAI metadata: {e}")
-                            
-                    # Cache metadata
-                    self.config.metadata_cache.put(image.path, metadata)
-                    
-                    return metadata
+            # Extract metadata from the header; PNG text chunks written ahead
+            # of the pixel data are parsed by open() without decoding
+            with Image.open(image.path) as img:
+                metadata = {
+                    'width': img.width,
+                    'height': img.height,
+                    'format': img.format,
+                    'mode': img.mode,
+                    'size': stats.st_size
+                }
+                
+                # Text chunks may also follow the pixel data; only load()
+                # reads those, so pay for it when the header had nothing
+                if img.format == 'PNG' and 'invokeai_metadata' not in img.info:
+                    img.load()
                     
-            return {}
+                # Extract InvokeAI metadata if available
+                if 'invokeai_metadata' in img.info:
+                    try:
+                        invoke_metadata = json_loads(img.info['invokeai_metadata'])
+                        metadata.update(invoke_metadata)
+                    except Exception as e:
+                        logger.debug(f"Error parsing InvokeAI metadata: {e}")
+                        
+            # Cache metadata
+            self.config.metadata_cache.put(cache_key, metadata)
+            
+            return metadata
                 
         except Exception as e:
             logger.error(f"Error getting metadata for {image.path}: {e}")
@@ -58,18 +70,30 @@ class MetadataService:
     def update_metadata(self, image: ImageEntity, metadata: Dict[str, Any]) -> bool:
         """Update metadata for an image"""
         try:
+            # Convert metadata to string
+            metadata_str = json.dumps(metadata)
+            
+            if image.extension == '.png':
+                # Rewrite the text chunk in place; pixel data is copied as-is
+                if rewrite_png_text_chunk(image.path, 'invokeai_metadata', metadata_str):
+                    # Update cache
+                    self.config.metadata_cache.put(_cache_key(image.path), metadata)
+                    
+                    # Update entity metadata
+                    image.metadata.custom_metadata.update(metadata)
+                    
+                    return True
+                return False
+                
             if img := open_image_efficient(image.path):
                 with img:
-                    # Convert metadata to string
-                    metadata_str = json.dumps(metadata)
-                    
                     # Update image metadata
                     img.info['invokeai_metadata'] = metadata_str
                     
                     # Save image with updated metadata
                     if save_image_optimized(img, image.path):
                         # Update cache
-                        self.config.metadata_cache.put(image.path, metadata)
+                        self.config.metadata_cache.put(_cache_key(image.path), metadata)
                         
                         # Update entity metadata
                         image.metadata.custom_metadata.update(metadata)
@@ -110,12 +134,13 @@ class MetadataService:
     def clear_metadata(self, image: ImageEntity) -> bool:
         """Clear all metadata for an image"""
         try:
+            old_key = _cache_key(image.path)
             if img := open_image_efficient(image.path):
                 with img:
                     img.info.clear()
                     if save_image_optimized(img, image.path):
                         # Clear cache
-                        self.config.metadata_cache.invalidate(image.path)
+                        self.config.metadata_cache.invalidate(old_key)
                         
                         # Clear entity metadata
                         image.metadata.custom_metadata.clear()
@@ -27,7 +27,7 @@ class RatingService:
         """Update the rating for an image"""
         try:
             # Validate rating
-            rating = max(0, min(rating, self.max_rating))
+            rating = 0 if rating < 0 else self.max_rating if rating > self.max_rating else rating
             
             # Update rating
             return self.image_repository.update_rating(path, rating)
@@ -38,7 +38,24 @@ class RatingService:
         
     def batch_update_ratings(self, ratings: Dict[str, int]) -> Dict[str, bool]:
         """Update ratings for multiple images"""
-        results = {}
-        for path, rating in ratings.items():
-            results[path] = self.update_rating(path, rating)
-        return results 
\ No newline at end of file
+        try:
+            # Validate ratings
+            top = self.max_rating
+            clamped = {
+                path: 0 if rating < 0 else top if rating > top else rating
+                for path, rating in ratings.items()
+            }
+            
+            # Update all ratings in one repository batch
+            results = self.image_repository.bulk_update_ratings(clamped)
+            
+        except Exception as e:
+            # Part of the batch may have been applied; retry item by item
+            logger.error(f"Error updating ratings for {len(ratings)} images, retrying individually: {e}")
+            return {path: self.update_rating(path, rating) for path, rating in ratings.items()}
+            
+        # Retry whatever the batch reported as failed
+        for path, ok in results.items():
+            if not ok:
+                results[path] = self.update_rating(path, ratings[path])
+        return results
@@ -52,7 +52,7 @@ class Container(containers.DeclarativeContainer):
     
     window_state = providers.Singleton(
         WindowStateManager,
-        state_file=providers.Factory(
+        state_file=providers.Singleton(
             lambda config: config.config_dir / "window_state.ini",
             config=app_config
         )
@@ -63,22 +63,27 @@ class Container(containers.DeclarativeContainer):
         user_config=user_config
     )
     
-    # Cache directories
-    cache_dir = providers.Factory(
+    # Cache directories (fixed once app_config exists, so resolved only once)
+    cache_dir = providers.Singleton(
         lambda config: config.cache_dir,
         config=app_config
     )
     
-    thumbnail_cache_dir = providers.Factory(
+    thumbnail_cache_dir = providers.Singleton(
         lambda cache_dir: cache_dir / "thumbnails",
         cache_dir=cache_dir
     )
     
-    metadata_cache_dir = providers.Factory(
+    metadata_cache_dir = providers.Singleton(
         lambda cache_dir: cache_dir / "metadata",
         cache_dir=cache_dir
     )
     
+    hash_cache_dir = providers.Singleton(
+        lambda cache_dir: cache_dir / "hashes",
+        cache_dir=cache_dir
+    )
+    
     # Infrastructure services
     thumbnail_cache = providers.Singleton(
         ThumbnailCache,
@@ -123,7 +128,8 @@ class Container(containers.DeclarativeContainer):
     )
     
     image_hash = providers.Singleton(
-        ImageHashService
+        ImageHashService,
+        cache_dir=hash_cache_dir
     )
     
     clustering = providers.Singleton(
@@ -153,6 +159,7 @@ class Container(containers.DeclarativeContainer):
             # Clean up caches
             self.thumbnail_cache().cleanup()
             self.metadata_cache().cleanup()
+            self.image_hash().cleanup()
             
             logger.info("Container resources cleaned up successfully")
             
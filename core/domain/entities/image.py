@@ -1,10 +1,10 @@
 """Domain entity for images"""
 
 import os
+import shutil
 import logging
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, Set
-from datetime import datetime
 from pathlib import Path
 
 from ...infrastructure.utils.image_utils import open_image_efficient, get_image_dimensions
@@ -13,7 +13,16 @@ from .image_status import ImageStatus
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Destination directories already created by move_to/copy_to
+_ENSURED_DIRS: Set[str] = set()
+
+def _ensure_dir(directory: str) -> None:
+    """Create a directory once per process"""
+    if directory and directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+@dataclass(slots=True)
 class Image:
     """Core domain entity representing an image"""
     
@@ -26,6 +35,13 @@ class Image:
     status: ImageStatus = field(default=ImageStatus.PENDING)
     selected: bool = field(default=False)
     
+    # Values derived from path, cached so gallery repaints don't rebuild
+    # Path objects or stat the file; refreshed whenever path changes
+    _cached_path: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _extension: str = field(default="", init=False, repr=False, compare=False)
+    _directory: str = field(default="", init=False, repr=False, compare=False)
+    _exists: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Validate image properties"""
         if not self.path or not isinstance(self.path, str):
@@ -36,6 +52,19 @@ class Image:
             raise ValueError("Invalid metadata type")
         if not isinstance(self.status, ImageStatus):
             raise ValueError("Invalid status type")
+        self._refresh_path_cache()
+        
+    def _refresh_path_cache(self) -> None:
+        """Recompute the values derived from path"""
+        path = Path(self.path)
+        self._cached_path = self.path
+        self._extension = path.suffix.lower()
+        self._directory = str(path.parent)
+        self._exists = None
+        
+    def invalidate(self) -> None:
+        """Forget cached file state, e.g. after the file changed on disk"""
+        self._refresh_path_cache()
     
     @property
     def width(self) -> int:
@@ -49,18 +78,26 @@ class Image:
         
     @property
     def exists(self) -> bool:
-        """Check if image file exists"""
-        return os.path.exists(self.path)
+        """Check if image file exists (cached until invalidate())"""
+        if self._cached_path != self.path:
+            self._refresh_path_cache()
+        if self._exists is None:
+            self._exists = os.path.exists(self.path)
+        return self._exists
         
     @property
     def extension(self) -> str:
         """Get file extension"""
-        return Path(self.path).suffix.lower()
+        if self._cached_path != self.path:
+            self._refresh_path_cache()
+        return self._extension
         
     @property
     def directory(self) -> str:
         """Get parent directory"""
-        return str(Path(self.path).parent)
+        if self._cached_path != self.path:
+            self._refresh_path_cache()
+        return self._directory
         
     @property
     def rating(self) -> int:
@@ -131,6 +168,7 @@ class Image:
         try:
             if self.exists:
                 os.remove(self.path)
+                self._exists = False
                 return True
             return False
         except Exception as e:
@@ -144,15 +182,20 @@ class Image:
                 return False
                 
             # Create destination directory if needed
-            dest_dir = os.path.dirname(destination)
-            os.makedirs(dest_dir, exist_ok=True)
+            _ensure_dir(os.path.dirname(destination))
             
+            # Never overwrite an existing file; os.rename would on POSIX
+            if os.path.exists(destination):
+                raise FileExistsError(f"Destination already exists: {destination}")
+                
             # Move file
             os.rename(self.path, destination)
             
             # Update path
             self.path = destination
             self.name = os.path.basename(destination)
+            self._refresh_path_cache()
+            self._exists = True
             
             return True
             
@@ -167,10 +210,14 @@ class Image:
                 return False
                 
             # Create destination directory if needed
-            dest_dir = os.path.dirname(destination)
-            os.makedirs(dest_dir, exist_ok=True)
+            _ensure_dir(os.path.dirname(destination))
             
-            # Copy file efficiently
+            # Same format: copy the bytes without decoding
+            if os.path.splitext(destination)[1].lower() == self.extension:
+                shutil.copyfile(self.path, destination)
+                return True
+                
+            # Re-encode to the destination format
             if img := open_image_efficient(self.path):
                 with img:
                     img.save(destination, quality=95, optimize=True)
@@ -225,8 +272,8 @@ class Image:
                     height=height,
                     format=path.suffix[1:].lower(),
                     size_bytes=stats.st_size,
-                    created_at=datetime.fromtimestamp(stats.st_ctime),
-                    modified_at=datetime.fromtimestamp(stats.st_mtime)
+                    ctime=stats.st_ctime,
+                    mtime=stats.st_mtime
                 )
                 
                 # Create image instance
@@ -0,0 +1,113 @@
+"""Columnar view over a collection of images"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from .image import Image
+from .image_status import ImageStatus
+
+# Sort keys accepted by sort(), mapped to their column attributes
+SORT_COLUMNS = {
+    'path': 'paths',
+    'rating': 'ratings',
+    'size_bytes': 'size_bytes',
+    'mtime': 'mtime',
+    'status': 'status',
+}
+
+class ImageCatalog:
+    """Struct-of-arrays catalog of images for fast filtering and sorting
+
+    Each image field used by filters and sorts is stored in its own numpy
+    column, so scans run as vectorized comparisons instead of attribute
+    lookups on N Image objects. The Image entities are kept alongside and
+    returned only for the rows that are selected.
+    """
+
+    def __init__(self, images: Sequence[Image]):
+        n = len(images)
+        self.images: List[Image] = list(images)
+        self.paths = np.empty(n, dtype=object)
+        # Extensions are few, so they are stored as small integer codes
+        self.extension_codes: Dict[str, int] = {}
+        self.extensions = np.empty(n, dtype=np.uint16)
+        self.ratings = np.empty(n, dtype=np.uint8)
+        self.size_bytes = np.empty(n, dtype=np.int64)
+        self.mtime = np.empty(n, dtype=np.float64)
+        self.status = np.empty(n, dtype=np.uint8)
+
+        for idx, image in enumerate(self.images):
+            metadata = image.metadata
+            self.paths[idx] = image.path
+            self.extensions[idx] = self.extension_codes.setdefault(image.extension, len(self.extension_codes))
+            self.ratings[idx] = metadata.rating
+            self.size_bytes[idx] = metadata.size_bytes
+            self.mtime[idx] = metadata.mtime
+            self.status[idx] = image.status.value
+
+        self._index: Dict[str, int] = {path: idx for idx, path in enumerate(self.paths)}
+
+    @classmethod
+    def from_images(cls, images: Sequence[Image]) -> 'ImageCatalog':
+        """Build a catalog from image entities"""
+        return cls(images)
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def index_of(self, path: str) -> Optional[int]:
+        """Get the row for a path"""
+        return self._index.get(path)
+
+    def to_image(self, idx: int) -> Image:
+        """Get the image entity for a row"""
+        return self.images[idx]
+
+    def to_images(self, indices: np.ndarray) -> List[Image]:
+        """Get the image entities for a set of rows, in order"""
+        return [self.images[idx] for idx in indices]
+
+    def extension_mask(self, extensions) -> np.ndarray:
+        """Get a row mask for images with any of the given extensions"""
+        codes = [self.extension_codes[ext] for ext in extensions if ext in self.extension_codes]
+        return np.isin(self.extensions, codes)
+
+    def find(self, specification) -> np.ndarray:
+        """Get the rows satisfying a specification"""
+        return np.flatnonzero(specification.mask(self))
+
+    def sort(self, column: str, reverse: bool = False,
+             indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get rows ordered by a column
+
+        Args:
+            column: One of SORT_COLUMNS
+            reverse: Sort descending
+            indices: Optional subset of rows to order (e.g. a find() result)
+        """
+        if column not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {column}")
+
+        if indices is None:
+            indices = np.arange(len(self))
+        values = getattr(self, SORT_COLUMNS[column])[indices]
+
+        # Ties keep catalog order in both directions
+        order = _stable_descending(values) if reverse else np.argsort(values, kind='stable')
+        return indices[order]
+
+    def set_rating(self, path: str, rating: int) -> None:
+        """Keep the rating column in sync after an update"""
+        if (idx := self._index.get(path)) is not None:
+            self.ratings[idx] = rating
+
+    def set_status(self, path: str, status: ImageStatus) -> None:
+        """Keep the status column in sync after an update"""
+        if (idx := self._index.get(path)) is not None:
+            self.status[idx] = status.value
+
+def _stable_descending(values: np.ndarray) -> np.ndarray:
+    """Argsort descending while keeping equal values in original order"""
+    n = len(values)
+    order = np.argsort(values[::-1], kind='stable')[::-1]
+    return n - 1 - order
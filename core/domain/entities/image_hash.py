@@ -1,11 +1,42 @@
 """Domain entity for image perceptual hashes"""
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
 import numpy as np
 from pathlib import Path
 import hashlib
-import json
+import os
+import struct
+
+try:
+    import xxhash
+except ImportError:  # Optional; file hashes fall back to SHA-256
+    xxhash = None
+
+# Number of set bits for every byte value
+POPCNT_LUT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Tile edge for pairwise_hamming; a 256x256 XOR tile stays within L2
+PAIRWISE_TILE = 256
+
+def pairwise_hamming(H: np.ndarray) -> np.ndarray:
+    """Compute all-pairs Hamming distances between packed hashes
+    
+    Args:
+        H: uint8 array of shape (N, bytes) holding packed hash bits
+        
+    Returns:
+        uint16 array of shape (N, N) with bit distances
+    """
+    n = len(H)
+    out = np.empty((n, n), dtype=np.uint16)
+    for i0 in range(0, n, PAIRWISE_TILE):
+        i1 = min(i0 + PAIRWISE_TILE, n)
+        for j0 in range(0, n, PAIRWISE_TILE):
+            j1 = min(j0 + PAIRWISE_TILE, n)
+            xor = H[i0:i1, None, :] ^ H[None, j0:j1, :]
+            out[i0:i1, j0:j1] = POPCNT_LUT[xor].sum(axis=-1, dtype=np.uint16)
+    return out
 
 @dataclass
 class ImageHash:
@@ -16,13 +47,19 @@ class ImageHash:
     hash_size: int  # Size of the hash (e.g., 8 for 8x8 hash)
     hash_type: str  # Type of hash (e.g., 'average', 'perceptual', 'difference')
     
+    # Hash bits packed into a single integer for XOR/popcount comparisons;
+    # any width fits, so >64-bit hashes still compare with one bit_count
+    packed: Optional[int] = field(default=None, repr=False, compare=False)
+    
     def __post_init__(self):
-        """Validate hash array shape"""
+        """Validate hash array shape and pack the bits unless already supplied"""
         if self.hash_array.shape != (self.hash_size, self.hash_size):
             raise ValueError(
                 f"Hash array shape {self.hash_array.shape} does not match "
                 f"hash size {self.hash_size}x{self.hash_size}"
             )
+        if self.packed is None:
+            self.packed = int.from_bytes(np.packbits(self.hash_array.ravel()).tobytes(), 'little')
     
     @property
     def hash_bits(self) -> int:
@@ -39,7 +76,7 @@ class ImageHash:
                 f"Hash sizes do not match: {self.hash_bits} != {other.hash_bits}"
             )
             
-        return float(np.count_nonzero(self.hash_array != other.hash_array))
+        return float((self.packed ^ other.packed).bit_count())
         
     def similarity(self, other: 'ImageHash') -> float:
         """Calculate similarity score (0-1) between two hashes"""
@@ -49,14 +86,47 @@ class ImageHash:
         except (TypeError, ValueError):
             return 0.0
             
-    def to_binary(self) -> List[bool]:
-        """Convert hash to binary list"""
-        return self.hash_array.flatten().tolist()
+    @classmethod
+    def pairwise_distance_matrix(cls, hashes: List['ImageHash']) -> np.ndarray:
+        """Calculate Hamming distances between every pair of hashes
+        
+        Uses the JIT-compiled kernel over 64-bit words when numba is
+        installed, otherwise a tiled XOR + popcount table over packed bytes.
+        
+        Returns:
+            uint16 array of shape (N, N) with bit distances
+        """
+        if not hashes:
+            return np.zeros((0, 0), dtype=np.uint16)
+            
+        hash_bits = hashes[0].hash_bits
+        if any(h.hash_bits != hash_bits for h in hashes):
+            raise ValueError("Hash sizes do not match")
+            
+        try:
+            from ...infrastructure.utils.hamming_jit import hamming_matrix
+        except ImportError:
+            pass
+        else:
+            word_bytes = 8 * ((hash_bits + 63) // 64)
+            words = np.frombuffer(
+                b''.join(h.packed.to_bytes(word_bytes, 'little') for h in hashes),
+                dtype='<u8'
+            ).reshape(len(hashes), -1)
+            return hamming_matrix(words)
+            
+        return pairwise_hamming(np.stack([np.packbits(h.hash_array.ravel()) for h in hashes]))
+        
+    def to_binary(self) -> int:
+        """Convert hash to its packed integer form
+        
+        For 8x8 hashes this equals np.packbits(hash_array).view(np.uint64)[0].
+        """
+        return self.packed
         
     def to_hex(self) -> str:
         """Convert hash to hexadecimal string"""
-        bits = np.packbits(self.hash_array.flatten())
-        return bits.tobytes().hex()
+        return self.packed.to_bytes((self.hash_bits + 7) // 8, 'little').hex()
         
     def to_dict(self) -> dict:
         """Convert hash to dictionary"""
@@ -70,40 +140,60 @@ class ImageHash:
     def from_hex(cls, hex_str: str, hash_size: int = 8, hash_type: str = 'average') -> 'ImageHash':
         """Create ImageHash from hexadecimal string"""
         try:
-            # Convert hex to bits
-            bits = np.unpackbits(np.frombuffer(bytes.fromhex(hex_str), dtype=np.uint8))
+            expected_bits = hash_size * hash_size
+            packed_bytes = bytes.fromhex(hex_str)[:(expected_bits + 7) // 8]
             
             # Validate bit length
-            expected_bits = hash_size * hash_size
-            if len(bits) < expected_bits:
+            if len(packed_bytes) * 8 < expected_bits:
                 raise ValueError(f"Not enough bits for {hash_size}x{hash_size} hash")
                 
+            # Convert hex to bits
+            bits = np.unpackbits(np.frombuffer(packed_bytes, dtype=np.uint8))[:expected_bits]
+            
             return cls(
-                hash_array=bits[:expected_bits].reshape(hash_size, hash_size),
+                hash_array=bits.reshape(hash_size, hash_size),
                 hash_size=hash_size,
-                hash_type=hash_type
+                hash_type=hash_type,
+                packed=cls._packed_from_bytes(packed_bytes, expected_bits)
             )
         except Exception as e:
             raise ValueError(f"Invalid hex hash: {e}")
         
     @classmethod
-    def from_binary(cls, binary: List[bool], hash_size: int = 8, hash_type: str = 'average') -> 'ImageHash':
-        """Create ImageHash from binary list"""
+    def from_binary(cls, binary: Union[int, List[bool]], hash_size: int = 8, hash_type: str = 'average') -> 'ImageHash':
+        """Create ImageHash from a packed integer or a binary list"""
         try:
-            binary_array = np.array(binary, dtype=bool)
             expected_bits = hash_size * hash_size
             
+            packed = None
+            
+            if isinstance(binary, (int, np.integer)):
+                # Reverse the little-endian packing done in __post_init__
+                packed_bytes = int(binary).to_bytes((expected_bits + 7) // 8, 'little')
+                binary_array = np.unpackbits(np.frombuffer(packed_bytes, dtype=np.uint8))[:expected_bits]
+                packed = cls._packed_from_bytes(packed_bytes, expected_bits)
+            else:
+                binary_array = np.array(binary, dtype=bool)
+                
             if len(binary_array) != expected_bits:
                 raise ValueError(f"Binary list length must be {expected_bits}")
                 
             return cls(
                 hash_array=binary_array.reshape(hash_size, hash_size),
                 hash_size=hash_size,
-                hash_type=hash_type
+                hash_type=hash_type,
+                packed=packed
             )
         except Exception as e:
             raise ValueError(f"Invalid binary hash: {e}")
             
+    @staticmethod
+    def _packed_from_bytes(packed_bytes: bytes, expected_bits: int) -> Optional[int]:
+        """Read the packed form straight from bytes when there are no padding bits"""
+        if expected_bits % 8:
+            return None
+        return int.from_bytes(packed_bytes, 'little')
+        
     @classmethod
     def from_dict(cls, data: dict) -> 'ImageHash':
         """Create ImageHash from dictionary"""
@@ -119,23 +209,42 @@ class ImageHash:
     @staticmethod
     def create_file_hash(file_path: str) -> str:
         """Create a hash from a file path that can be used for caching"""
+        return ImageHash.create_file_hash_bytes(file_path).hex()
+        
+    @staticmethod
+    def create_file_hash_bytes(file_path: str) -> bytes:
+        """Create the raw digest behind create_file_hash
+        
+        The digest fingerprints path, size and modification time rather than
+        file contents, so it changes whenever the file is rewritten. It is
+        16 bytes of XXH3-128 when xxhash is installed, else 32 of SHA-256.
+        """
         try:
             path = Path(file_path)
-            if not path.exists():
-                return ""
-                
+            
             # Get file stats for hash input
             stats = path.stat()
             
-            # Create hash input combining path, size and modification time
-            hash_input = json.dumps({
-                'path': str(path.absolute()),
-                'size': stats.st_size,
-                'mtime': stats.st_mtime
-            }, sort_keys=True).encode()
+            # Hash path, size and modification time directly
+            data = os.fsencode(path.absolute()) + struct.pack('<qd', stats.st_size, stats.st_mtime)
+            if xxhash:
+                return xxhash.xxh3_128_digest(data)
+            return hashlib.sha256(data).digest()
             
-            # Create hash
-            return hashlib.sha256(hash_input).hexdigest()
+        except Exception:
+            return b""
             
-        except Exception as e:
-            return "" 
\ No newline at end of file
+    @staticmethod
+    def create_content_hash(file_path: str) -> str:
+        """Create a SHA-256 hash of the file contents for exact deduplication
+        
+        Unlike create_file_hash this reads the whole file, so keep it out of
+        cache key paths. hashlib.file_digest streams the file through a
+        fixed buffer into OpenSSL, which uses SHA extensions where available.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+                
+        except Exception:
+            return ""
@@ -1,10 +1,19 @@
 """Domain entity for image metadata"""
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, Any, Set
 from datetime import datetime
 
-@dataclass
+def _intern_tag(tag: str) -> str:
+    """Normalize a tag and return the shared instance of that string
+    
+    Tag vocabularies overlap heavily across images, so interning keeps one
+    str object per distinct tag instead of one per image.
+    """
+    return sys.intern(tag.lower().strip())
+
+@dataclass(slots=True)
 class ImageMetadata:
     """Core domain entity representing image metadata"""
     
@@ -13,14 +22,26 @@ class ImageMetadata:
     height: int
     format: str
     size_bytes: int
-    created_at: datetime
-    modified_at: datetime
+    
+    # File timestamps as POSIX seconds; datetimes are built on demand
+    ctime: float
+    mtime: float
     
     # Optional properties with defaults
     rating: int = field(default=0)
     tags: Set[str] = field(default_factory=set)
     custom_metadata: Dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def created_at(self) -> datetime:
+        """Get creation time"""
+        return datetime.fromtimestamp(self.ctime)
+        
+    @property
+    def modified_at(self) -> datetime:
+        """Get modification time"""
+        return datetime.fromtimestamp(self.mtime)
+        
     @property
     def size_mb(self) -> float:
         """Get file size in megabytes"""
@@ -42,16 +63,16 @@ class ImageMetadata:
     def add_tag(self, tag: str) -> None:
         """Add a tag"""
         if tag and isinstance(tag, str):
-            self.tags.add(tag.lower().strip())
+            self.tags.add(_intern_tag(tag))
         
     def remove_tag(self, tag: str) -> None:
         """Remove a tag"""
         if tag and isinstance(tag, str):
-            self.tags.discard(tag.lower().strip())
+            self.tags.discard(_intern_tag(tag))
         
     def has_tag(self, tag: str) -> bool:
         """Check if image has tag"""
-        return tag.lower().strip() in self.tags if tag and isinstance(tag, str) else False
+        return _intern_tag(tag) in self.tags if tag and isinstance(tag, str) else False
         
     def clear_tags(self) -> None:
         """Clear all tags"""
@@ -69,8 +90,8 @@ class ImageMetadata:
             'height': self.height,
             'format': self.format,
             'size_bytes': self.size_bytes,
-            'created_at': self.created_at.timestamp(),
-            'modified_at': self.modified_at.timestamp(),
+            'created_at': self.ctime,
+            'modified_at': self.mtime,
             'rating': self.rating,
             'tags': list(self.tags),
             'custom_metadata': self.custom_metadata
@@ -84,9 +105,9 @@ class ImageMetadata:
             height=data['height'],
             format=data['format'],
             size_bytes=data['size_bytes'],
-            created_at=datetime.fromtimestamp(data['created_at']),
-            modified_at=datetime.fromtimestamp(data['modified_at']),
+            ctime=data['created_at'],
+            mtime=data['modified_at'],
             rating=data.get('rating', 0),
-            tags=set(data.get('tags', [])),
+            tags={_intern_tag(tag) for tag in data.get('tags', [])},
             custom_metadata=data.get('custom_metadata', {})
         ) 
\ No newline at end of file
@@ -13,44 +13,26 @@ class ImageStatus(Enum):
     @classmethod
     def from_string(cls, status: str) -> 'ImageStatus':
         """Convert string to status enum"""
-        status_map = {
-            'pending': cls.PENDING,
-            'approved': cls.APPROVED,
-            'rejected': cls.REJECTED,
-            'needs_work': cls.NEEDS_WORK
-        }
-        return status_map.get(status.lower(), cls.PENDING)
+        return _FROM_STRING_MAP.get(status) or _FROM_STRING_MAP.get(status.lower(), cls.PENDING)
         
     def __str__(self) -> str:
         """Convert status to string"""
-        return self.name.lower().replace('_', ' ')
+        return _STR_MAP[self]
         
     @property
     def display_name(self) -> str:
         """Get formatted display name"""
-        return self.name.title().replace('_', ' ')
+        return _DISPLAY_MAP[self]
         
     @property
     def color(self) -> str:
         """Get color code for status"""
-        color_map = {
-            ImageStatus.PENDING: '#808080',     # Gray
-            ImageStatus.APPROVED: '#00C853',    # Green
-            ImageStatus.REJECTED: '#D50000',    # Red
-            ImageStatus.NEEDS_WORK: '#FF6D00'   # Orange
-        }
-        return color_map[self]
+        return _COLOR_MAP[self]
         
     @property
     def description(self) -> str:
         """Get status description"""
-        desc_map = {
-            ImageStatus.PENDING: "Not yet reviewed",
-            ImageStatus.APPROVED: "Approved for use",
-            ImageStatus.REJECTED: "Rejected from use",
-            ImageStatus.NEEDS_WORK: "Requires modifications"
-        }
-        return desc_map[self]
+        return _DESC_MAP[self]
         
     @classmethod
     def get_all_statuses(cls) -> List['ImageStatus']:
@@ -68,4 +50,31 @@ class ImageStatus(Enum):
         
     def is_final(self) -> bool:
         """Check if status is final"""
-        return self in (ImageStatus.APPROVED, ImageStatus.REJECTED) 
\ No newline at end of file
+        return self in (ImageStatus.APPROVED, ImageStatus.REJECTED)
+
+# Lookup tables built once at import, so the properties above are plain dict lookups
+# Holds the casings written by Image.to_dict (name) and the repository (lowercase)
+# so deserializing usually skips str.lower()
+_FROM_STRING_MAP = {
+    key: status
+    for status in ImageStatus
+    for key in (status.name, status.name.lower())
+}
+
+_STR_MAP = {status: status.name.lower().replace('_', ' ') for status in ImageStatus}
+
+_DISPLAY_MAP = {status: status.name.title().replace('_', ' ') for status in ImageStatus}
+
+_COLOR_MAP = {
+    ImageStatus.PENDING: '#808080',     # Gray
+    ImageStatus.APPROVED: '#00C853',    # Green
+    ImageStatus.REJECTED: '#D50000',    # Red
+    ImageStatus.NEEDS_WORK: '#FF6D00'   # Orange
+}
+
+_DESC_MAP = {
+    ImageStatus.PENDING: "Not yet reviewed",
+    ImageStatus.APPROVED: "Approved for use",
+    ImageStatus.REJECTED: "Rejected from use",
+    ImageStatus.NEEDS_WORK: "Requires modifications"
+}
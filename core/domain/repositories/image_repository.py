@@ -1,7 +1,7 @@
 """Repository interface for image loading and management"""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Set
+from typing import Iterator, List, Optional, Dict, Any, Set
 from pathlib import Path
 from ..entities.image import Image
 from ..entities.image_status import ImageStatus
@@ -11,9 +11,13 @@ class ImageRepository(ABC):
     """Repository interface for loading and managing images"""
     
     @abstractmethod
+    def iter_images(self, directory: str) -> Iterator[Image]:
+        """Yield images in a directory as they are found"""
+        pass
+        
     def list_images(self, directory: str) -> List[Image]:
         """List all images in a directory"""
-        pass
+        return list(self.iter_images(directory))
         
     @abstractmethod
     def get_by_path(self, path: str) -> Optional[Image]:
@@ -51,15 +55,27 @@ class ImageRepository(ABC):
         pass
         
     @abstractmethod
+    def iter_find(self, specification: ImageSpecification) -> Iterator[Image]:
+        """Yield images matching a specification as they are found"""
+        pass
+        
     def find(self, specification: ImageSpecification) -> List[Image]:
         """Find images matching a specification"""
-        pass
+        return list(self.iter_find(specification))
         
     @abstractmethod
     def update_rating(self, path: str, rating: int) -> bool:
         """Update rating for an image"""
         pass
         
+    def bulk_update_ratings(self, ratings: Dict[str, int]) -> Dict[str, bool]:
+        """Update ratings for multiple images in one batch
+        
+        Implementations with a transactional backend should override this to
+        commit all writes at once; the default updates one path at a time.
+        """
+        return {path: self.update_rating(path, rating) for path, rating in ratings.items()}
+        
     @abstractmethod
     def update_status(self, path: str, status: ImageStatus) -> bool:
         """Update status for an image"""
@@ -1,17 +1,51 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Set
+from typing import Any, Callable, Dict, List, Set
+import numpy as np
 from ..entities.image import Image
 from ..entities.image_status import ImageStatus
 
 class ImageSpecification(ABC):
     """Base specification interface"""
     
+    __slots__ = ()
+    
+    # Rough per-image evaluation cost and fraction of images expected to
+    # match; composites use them to evaluate cheap, decisive checks first
+    cost: int = 1
+    selectivity: float = 0.5
+    
     @abstractmethod
     def is_satisfied_by(self, image: Image) -> bool:
         """Check if image satisfies specification"""
         pass
         
+    def mask(self, catalog) -> np.ndarray:
+        """Evaluate against every row of an ImageCatalog
+        
+        Specifications on catalog columns override this with a vectorized
+        comparison; the default runs the compiled predicate per image.
+        """
+        matches = self.compile()
+        return np.fromiter(
+            (matches(image) for image in catalog.images),
+            dtype=bool, count=len(catalog)
+        )
+        
+    def compile(self) -> Callable[[Image], bool]:
+        """Build a single predicate function for the whole specification tree
+        
+        Each node contributes a Python expression and the tree is compiled
+        into one lambda, so evaluating an image costs no per-node method
+        calls. Values are bound by name; no user data enters the source.
+        """
+        namespace: Dict[str, Any] = {}
+        return eval(f"lambda img: {self._source(namespace)}", namespace)
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        """Expression for this node in terms of img; defaults to a method call"""
+        return f"{_bind(namespace, self.is_satisfied_by)}(img)"
+        
     def and_(self, other: 'ImageSpecification') -> 'AndSpecification':
         """Combine with another specification using AND"""
         return AndSpecification(self, other)
@@ -27,90 +61,226 @@ class ImageSpecification(ABC):
 class AndSpecification(ImageSpecification):
     """Combine specifications with AND"""
     
+    __slots__ = ('specifications',)
+    
     def __init__(self, *specifications: ImageSpecification):
-        self.specifications = specifications
+        # Cheapest, then most likely to fail, first
+        self.specifications = tuple(sorted(specifications, key=lambda s: (s.cost, s.selectivity)))
+        
+    @property
+    def cost(self) -> int:
+        return sum(spec.cost for spec in self.specifications)
+        
+    @property
+    def selectivity(self) -> float:
+        return float(np.prod([spec.selectivity for spec in self.specifications]))
         
     def is_satisfied_by(self, image: Image) -> bool:
         return all(spec.is_satisfied_by(image) for spec in self.specifications)
+        
+    def mask(self, catalog) -> np.ndarray:
+        # Children are cost-ordered, so per-image fallbacks come last and
+        # are skipped once the cheap column masks have ruled everything out
+        result = np.ones(len(catalog), dtype=bool)
+        for spec in self.specifications:
+            if not result.any():
+                break
+            result &= spec.mask(catalog)
+        return result
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        if not self.specifications:
+            return "True"  # Empty conjunction, as in all()
+        return "(" + " and ".join(spec._source(namespace) for spec in self.specifications) + ")"
 
 class OrSpecification(ImageSpecification):
     """Combine specifications with OR"""
     
+    __slots__ = ('specifications',)
+    
     def __init__(self, *specifications: ImageSpecification):
-        self.specifications = specifications
+        # Cheapest, then most likely to match, first
+        self.specifications = tuple(sorted(specifications, key=lambda s: (s.cost, -s.selectivity)))
+        
+    @property
+    def cost(self) -> int:
+        return sum(spec.cost for spec in self.specifications)
+        
+    @property
+    def selectivity(self) -> float:
+        return 1.0 - float(np.prod([1.0 - spec.selectivity for spec in self.specifications]))
         
     def is_satisfied_by(self, image: Image) -> bool:
         return any(spec.is_satisfied_by(image) for spec in self.specifications)
+        
+    def mask(self, catalog) -> np.ndarray:
+        result = np.zeros(len(catalog), dtype=bool)
+        for spec in self.specifications:
+            result |= spec.mask(catalog)
+        return result
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        if not self.specifications:
+            return "False"  # Empty disjunction, as in any()
+        return "(" + " or ".join(spec._source(namespace) for spec in self.specifications) + ")"
 
 class NotSpecification(ImageSpecification):
     """Negate a specification"""
     
+    __slots__ = ('specification',)
+    
     def __init__(self, specification: ImageSpecification):
         self.specification = specification
         
+    @property
+    def cost(self) -> int:
+        return self.specification.cost
+        
+    @property
+    def selectivity(self) -> float:
+        return 1.0 - self.specification.selectivity
+        
     def is_satisfied_by(self, image: Image) -> bool:
         return not self.specification.is_satisfied_by(image)
+        
+    def mask(self, catalog) -> np.ndarray:
+        return ~self.specification.mask(catalog)
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        return f"(not {self.specification._source(namespace)})"
 
 # Concrete specifications
 class RatingSpecification(ImageSpecification):
     """Filter images by minimum rating"""
     
+    __slots__ = ('min_rating',)
+    
     def __init__(self, min_rating: int):
         self.min_rating = min_rating
         
     def is_satisfied_by(self, image: Image) -> bool:
         return image.rating >= self.min_rating
+        
+    def mask(self, catalog) -> np.ndarray:
+        return catalog.ratings >= self.min_rating
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        return f"(img.metadata.rating >= {_bind(namespace, self.min_rating)})"
 
 class StatusSpecification(ImageSpecification):
     """Filter images by status"""
     
+    __slots__ = ('status',)
+    
     def __init__(self, status: ImageStatus):
         self.status = status
         
     def is_satisfied_by(self, image: Image) -> bool:
         return image.status == self.status
+        
+    def mask(self, catalog) -> np.ndarray:
+        return catalog.status == self.status.value
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        return f"(img.status is {_bind(namespace, self.status)})"
 
 class TagsSpecification(ImageSpecification):
     """Filter images by tags"""
     
+    __slots__ = ('tags', 'match_all')
+    cost = 3
+    
     def __init__(self, tags: Set[str], match_all: bool = True):
-        self.tags = {tag.lower() for tag in tags}
+        self.tags = frozenset(tag.lower() for tag in tags)
         self.match_all = match_all
         
     def is_satisfied_by(self, image: Image) -> bool:
+        # metadata.tags avoids the defensive copy made by Image.tags
+        if self.match_all:
+            return self.tags.issubset(image.metadata.tags)
+        return not self.tags.isdisjoint(image.metadata.tags)
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        tags = _bind(namespace, self.tags)
         if self.match_all:
-            return self.tags.issubset(image.tags)
-        return bool(self.tags.intersection(image.tags))
+            return f"{tags}.issubset(img.metadata.tags)"
+        return f"(not {tags}.isdisjoint(img.metadata.tags))"
 
 class FileExtensionSpecification(ImageSpecification):
     """Filter images by file extension"""
     
+    __slots__ = ('extensions',)
+    cost = 2
+    
     def __init__(self, extensions: Set[str]):
-        self.extensions = {ext.lower() for ext in extensions}
+        self.extensions = frozenset(ext.lower() for ext in extensions)
         
     def is_satisfied_by(self, image: Image) -> bool:
-        return image.extension.lower() in self.extensions
+        return image.extension in self.extensions  # Already lowercase
+        
+    def mask(self, catalog) -> np.ndarray:
+        return catalog.extension_mask(self.extensions)
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        return f"(img.extension in {_bind(namespace, self.extensions)})"
 
 class ImageSizeSpecification(ImageSpecification):
     """Filter images by size range"""
     
+    __slots__ = ('min_size', 'max_size')
+    
     def __init__(self, min_size: int = 0, max_size: int = float('inf')):
         self.min_size = min_size
         self.max_size = max_size
         
     def is_satisfied_by(self, image: Image) -> bool:
         return self.min_size <= image.metadata.size_bytes <= self.max_size
+        
+    def mask(self, catalog) -> np.ndarray:
+        return (catalog.size_bytes >= self.min_size) & (catalog.size_bytes <= self.max_size)
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        return (
+            f"({_bind(namespace, self.min_size)} <= img.metadata.size_bytes"
+            f" <= {_bind(namespace, self.max_size)})"
+        )
 
 class DateRangeSpecification(ImageSpecification):
     """Filter images by date range"""
     
+    __slots__ = ('start_date', 'end_date')
+    cost = 3
+    
     def __init__(self, start_date: datetime = None, end_date: datetime = None):
         self.start_date = start_date
         self.end_date = end_date
         
     def is_satisfied_by(self, image: Image) -> bool:
-        if self.start_date and image.metadata.modified_at < self.start_date:
+        if self.start_date and image.metadata.mtime < self.start_date.timestamp():
             return False
-        if self.end_date and image.metadata.modified_at > self.end_date:
+        if self.end_date and image.metadata.mtime > self.end_date.timestamp():
             return False
-        return True 
\ No newline at end of file
+        return True
+        
+    def mask(self, catalog) -> np.ndarray:
+        result = np.ones(len(catalog), dtype=bool)
+        if self.start_date:
+            result &= catalog.mtime >= self.start_date.timestamp()
+        if self.end_date:
+            result &= catalog.mtime <= self.end_date.timestamp()
+        return result
+        
+    def _source(self, namespace: Dict[str, Any]) -> str:
+        # Timestamps are converted once here instead of per image
+        conditions = ["True"]
+        if self.start_date:
+            conditions.append(f"img.metadata.mtime >= {_bind(namespace, self.start_date.timestamp())}")
+        if self.end_date:
+            conditions.append(f"img.metadata.mtime <= {_bind(namespace, self.end_date.timestamp())}")
+        return "(" + " and ".join(conditions) + ")"
+
+def _bind(namespace: Dict[str, Any], value: Any) -> str:
+    """Store a value for a compiled predicate and return the name it is bound to"""
+    name = f"_v{len(namespace)}"
+    namespace[name] = value
+    return name
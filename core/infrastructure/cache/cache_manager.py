@@ -1,22 +1,48 @@
 from pathlib import Path
-import json
+import atexit
 import logging
+import os
 import shutil
 import time
-from typing import Any, Dict, Optional, Set
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
+from typing import Any, Dict, Iterator, Optional, Set, Union
 from abc import ABC, abstractmethod
 
+from ..utils.cache_codec import CACHE_SUFFIX, LEGACY_SUFFIX, encode, decode, decode_legacy
+from ..utils.file_utils import atomic_write_bytes
+
 logger = logging.getLogger(__name__)
 
+# Threads for directory walks and deletes; these wait on filesystem
+# latency rather than CPU, so more threads than cores still helps
+IO_WORKERS = 16
+
+# Seconds an index change may wait before it is written out
+INDEX_FLUSH_DELAY = 5.0
+
+def _flush_at_exit(manager_ref: 'weakref.ref[CacheManager]') -> None:
+    """Flush a cache manager at interpreter exit if it is still alive"""
+    if (manager := manager_ref()) is not None:
+        manager.flush()
+
 class CacheManager(ABC):
     """Base class for cache management"""
     
     def __init__(self, cache_dir: Path, max_age_days: int = 30):
         self.cache_dir = Path(cache_dir)
         self.max_age_seconds = max_age_days * 24 * 60 * 60
-        self.index_file = self.cache_dir / "cache_index.json"
+        self.index_file = self.cache_dir / f"cache_index{CACHE_SUFFIX}"
         self.cache_index: Dict[str, Dict[str, Any]] = {}
         
+        # Index changes are batched and written by flush()
+        self._dirty = False
+        self._flush_timer: Optional[Timer] = None
+        self._flush_lock = Lock()
+        # Weak, so the exit hook doesn't keep every manager alive
+        atexit.register(_flush_at_exit, weakref.ref(self))
+        
         # Create cache directory
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
@@ -26,9 +52,11 @@ class CacheManager(ABC):
     def _load_index(self):
         """Load cache index from file"""
         try:
-            if self.index_file.exists():
-                with open(self.index_file) as f:
-                    self.cache_index = json.load(f)
+            self.cache_index = decode(self.index_file.read_bytes())
+        except FileNotFoundError:
+            # Fall back to an index written as JSON; it is rewritten on next save
+            legacy_file = self.index_file.with_suffix(LEGACY_SUFFIX)
+            self.cache_index = decode_legacy(legacy_file.read_bytes()) if legacy_file.exists() else {}
         except Exception as e:
             logger.error(f"Error loading cache index: {e}")
             self.cache_index = {}
@@ -36,11 +64,30 @@ class CacheManager(ABC):
     def _save_index(self):
         """Save cache index to file"""
         try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.cache_index, f, indent=4)
+            atomic_write_bytes(self.index_file, encode(self.cache_index))
         except Exception as e:
             logger.error(f"Error saving cache index: {e}")
             
+    def _mark_dirty(self):
+        """Schedule an index write, coalescing changes over INDEX_FLUSH_DELAY"""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = Timer(INDEX_FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                
+    def flush(self):
+        """Write the index now if it has unsaved changes"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+        self._save_index()
+            
     def clear(self):
         """Clear all cached data"""
         try:
@@ -68,9 +115,19 @@ class CacheManager(ABC):
                 if current_time - data['timestamp'] > self.max_age_seconds:
                     expired_keys.add(key)
                     
-            # Remove expired entries
+            if not expired_keys:
+                return
+                
+            # Delete the files concurrently, then update the index once
+            cache_paths = [self.cache_dir / self.cache_index[key]['filename'] for key in expired_keys]
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                list(executor.map(lambda path: path.unlink(missing_ok=True), cache_paths))
+                
             for key in expired_keys:
-                self.invalidate(key)
+                del self.cache_index[key]
+            with self._flush_lock:
+                self._dirty = True
+            self.flush()
                 
         except Exception as e:
             logger.error(f"Error cleaning cache: {e}")
@@ -86,9 +143,9 @@ class CacheManager(ABC):
                 if cache_path.exists():
                     cache_path.unlink()
                     
-                # Remove from index
+                # Remove from index; written out by the next flush
                 del self.cache_index[key]
-                self._save_index()
+                self._mark_dirty()
                 
         except Exception as e:
             logger.error(f"Error invalidating cache entry: {e}")
@@ -96,10 +153,18 @@ class CacheManager(ABC):
     def get_size(self) -> int:
         """Get total size of cache in bytes"""
         try:
+            # Walk top-level subdirectories (e.g. hash shards) concurrently
             total_size = 0
-            for path in self.cache_dir.rglob('*'):
-                if path.is_file():
-                    total_size += path.stat().st_size
+            subdirs = []
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                        
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                total_size += sum(executor.map(lambda path: sum(_file_sizes(path)), subdirs))
             return total_size
         except Exception as e:
             logger.error(f"Error calculating cache size: {e}")
@@ -117,4 +182,17 @@ class CacheManager(ABC):
     @abstractmethod
     def put(self, key: str, data: Any) -> bool:
         """Add entry to cache"""
-        pass 
\ No newline at end of file
+        pass
+
+def _file_sizes(directory: Union[str, Path]) -> Iterator[int]:
+    """Yield sizes of all files under a directory
+    
+    scandir reports entry types from the directory read itself, so only
+    regular files cost a stat call (none on Windows, where it is cached too).
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _file_sizes(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.stat(follow_symlinks=False).st_size
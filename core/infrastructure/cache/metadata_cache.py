@@ -1,15 +1,27 @@
 """Metadata cache implementation"""
 
-import json
+import hashlib
 import logging
+import sqlite3
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 from threading import Lock
 
+from ..utils.cache_codec import CACHE_SUFFIX, LEGACY_SUFFIX, encode, decode
+
 logger = logging.getLogger(__name__)
 
+def _key_digest(key: str) -> bytes:
+    """Derive the stored row key; stable across runs, unlike hash()"""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
 class MetadataCache:
-    """Cache for storing and retrieving image metadata"""
+    """Cache for storing and retrieving image metadata
+    
+    Entries live in a single SQLite database in WAL mode, so a put is one
+    row write rather than one file (and inode) per image.
+    """
     
     def __init__(self, cache_dir: Path, max_size_mb: int = 1000):
         """Initialize metadata cache
@@ -22,6 +34,8 @@ class MetadataCache:
         self.max_size = max_size_mb * 1024 * 1024  # Convert to bytes
         self.cache_lock = Lock()
         self._ensure_cache_dir()
+        self.conn = self._open_database()
+        self._remove_legacy_files()
         
     def _ensure_cache_dir(self) -> None:
         """Ensure cache directory exists"""
@@ -31,14 +45,40 @@ class MetadataCache:
             logger.error(f"Error creating cache directory: {e}")
             raise
             
+    def _open_database(self) -> sqlite3.Connection:
+        """Open the cache database, creating the table if needed"""
+        # Autocommit; access from worker threads is serialized by cache_lock
+        conn = sqlite3.connect(
+            self.cache_dir / "metadata.db",
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key BLOB PRIMARY KEY, blob BLOB, mtime REAL)"
+        )
+        return conn
+        
+    def _remove_legacy_files(self) -> None:
+        """Delete per-key files left by the old layout
+        
+        Their names came from the per-process randomized hash(), so they
+        could never be found again after a restart.
+        """
+        try:
+            for suffix in {CACHE_SUFFIX, LEGACY_SUFFIX}:
+                for cache_file in self.cache_dir.glob(f"*{suffix}"):
+                    cache_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Error removing legacy cache files: {e}")
+            
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get metadata from cache"""
         try:
             with self.cache_lock:
-                cache_file = self.cache_dir / f"{hash(key)}.json"
-                if cache_file.exists():
-                    with open(cache_file, 'r') as f:
-                        return json.load(f)
+                row = self.conn.execute("SELECT blob FROM meta WHERE key = ?", (_key_digest(key),)).fetchone()
+            return decode(row[0]) if row else None
         except Exception as e:
             logger.error(f"Error getting from cache: {e}")
         return None
@@ -46,11 +86,13 @@ class MetadataCache:
     def put(self, key: str, metadata: Dict[str, Any]) -> bool:
         """Put metadata into cache"""
         try:
+            blob = encode(metadata)
             with self.cache_lock:
-                cache_file = self.cache_dir / f"{hash(key)}.json"
-                with open(cache_file, 'w') as f:
-                    json.dump(metadata, f)
-                return True
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, blob, mtime) VALUES (?, ?, ?)",
+                    (_key_digest(key), blob, time.time())
+                )
+            return True
         except Exception as e:
             logger.error(f"Error putting to cache: {e}")
             return False
@@ -59,9 +101,7 @@ class MetadataCache:
         """Remove item from cache"""
         try:
             with self.cache_lock:
-                cache_file = self.cache_dir / f"{hash(key)}.json"
-                if cache_file.exists():
-                    cache_file.unlink()
+                self.conn.execute("DELETE FROM meta WHERE key = ?", (_key_digest(key),))
         except Exception as e:
             logger.error(f"Error invalidating cache item: {e}")
             
@@ -69,15 +109,14 @@ class MetadataCache:
         """Clear all cached items"""
         try:
             with self.cache_lock:
-                for cache_file in self.cache_dir.glob("*.json"):
-                    cache_file.unlink()
+                self.conn.execute("DELETE FROM meta")
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
             
     def cleanup(self) -> None:
         """Clean up resources"""
         try:
-            # Implement cleanup if needed
-            pass
+            with self.cache_lock:
+                self.conn.close()
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}") 
\ No newline at end of file
+            logger.error(f"Error during cleanup: {e}")
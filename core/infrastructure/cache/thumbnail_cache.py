@@ -4,7 +4,12 @@ import logging
 import time
 import json
 import os
-from typing import Optional, Tuple, Dict, Any, Set, Union
+import re
+import multiprocessing
+import shutil
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, Set, Union, List
 from PIL import Image, ImageFile
 from PIL.Image import DecompressionBombError
 from queue import PriorityQueue, Empty, Queue
@@ -18,9 +23,10 @@ import weakref
 from core.domain.entities.image import Image as DomainImage
 from core.domain.entities.image_metadata import ImageMetadata
 from core.domain.entities.image_hash import ImageHash
-from ...infrastructure.utils.image_utils import open_image_efficient, save_image_optimized
+from ...infrastructure.utils.image_utils import render_thumbnail
 from ...infrastructure.utils.worker_pool import WorkerPool
-from core.infrastructure.utils.qt_utils import load_qimage, scale_qimage, is_valid_qimage
+from core.infrastructure.utils.qt_utils import load_qimage, scale_qimage, save_qimage, is_valid_qimage
+from core.infrastructure.cache.cache_manager import IO_WORKERS
 
 # Configure PIL globally to prevent window creation
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -28,6 +34,15 @@ Image.MAX_IMAGE_PIXELS = None  # Disable DecompressionBomb check
 
 logger = logging.getLogger(__name__)
 
+# Name of the per-size directories under thumbnails/
+SIZE_DIR_PATTERN = re.compile(r'\d+x\d+')
+
+@lru_cache(maxsize=4096)
+def _cache_name_for(key: str, size: int, mtime_ns: int) -> str:
+    """Memoized cache name; size and mtime are part of the key so a
+    rewritten file still gets a new name"""
+    return ImageHash.create_file_hash(key)
+
 class ThumbnailCache(QObject):
     """Cache system for image thumbnails"""
     
@@ -52,13 +67,27 @@ class ThumbnailCache(QObject):
         self.pending_requests = {}
         self.pending_lock = Lock()
         
-        # Create cache directory
+        # Create cache directory; thumbnails are grouped by generation size
+        # (so changing max_size never serves mismatched files) and spread
+        # over 256 shard subdirectories by the first byte of their name
         self.thumbnail_dir.mkdir(parents=True, exist_ok=True)
+        self.size_dir = self._size_dir(max_size)
+        self._shard_dirs: Set[Path] = set()
+        self._remove_legacy_entries()
         
-        # Initialize worker pool
+        # Decode and resample in worker processes so the work isn't
+        # serialized on the GIL (spawned, since forking a Qt process is unsafe);
+        # num_workers caps the pool, never exceeding the available cores
+        num_processes = min(num_workers, os.cpu_count() or 1)
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=num_processes,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        
+        # Initialize worker pool (threads only dispatch to the process pool)
         self.worker_pool = WorkerPool(
             process_func=self._generate_thumbnail_worker,
-            num_workers=4,
+            num_workers=num_processes,
             name="ThumbnailGenerator"
         )
         
@@ -89,63 +118,84 @@ class ThumbnailCache(QObject):
     def _generate_thumbnail(self, key: str, image_path: str) -> Optional[Path]:
         """Generate thumbnail for an image"""
         try:
-            cache_path = self.thumbnail_dir / f"{self._get_cache_name(key)}.jpg"
+            cache_path = self._get_cache_path(key)
             
             # Check if thumbnail already exists and is valid
             if cache_path.exists() and cache_path.stat().st_size > 0:
                 return cache_path
                 
+            if cache_path.parent not in self._shard_dirs:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                self._shard_dirs.add(cache_path.parent)
+                
             # Calculate target size for draft mode (2x final size for better quality)
             draft_size = (
                 max(self.max_size[0] * 2, 400),
                 max(self.max_size[1] * 2, 300)
             )
             
-            # Open and process image in a single context
-            img = None
-            try:
-                img = open_image_efficient(image_path, draft_size)
-                if img is None:
-                    logger.error(f"Failed to open image: {image_path}")
-                    return None
-
-                # Create thumbnail
-                img.thumbnail(self.max_size, Image.Resampling.LANCZOS)
+            # Decode, resize and save in a worker process
+            future = self.process_pool.submit(
+                render_thumbnail, image_path, str(cache_path), self.max_size, draft_size
+            )
+            if future.result():
+                return cache_path
                 
-                # Save optimized JPEG
-                if save_image_optimized(img, cache_path):
-                    return cache_path
-                return None
-
-            except Exception as e:
-                logger.error(f"Error processing image {image_path}: {e}", exc_info=True)
-                return None
-            finally:
-                # Ensure image is closed
-                if img is not None:
-                    try:
-                        img.close()
-                    except Exception as e:
-                        logger.error(f"Error closing image: {e}")
+            logger.error(f"Failed to generate thumbnail: {image_path}")
+            return None
                         
         except Exception as e:
             logger.error(f"Error generating thumbnail for {image_path}: {str(e)}", exc_info=True)
             return None
             
     def _get_cache_name(self, key: str) -> str:
-        """Generate cache filename using ImageHash"""
-        return ImageHash.create_file_hash(key)
+        """Generate cache filename using ImageHash, hashing each file version once"""
+        try:
+            stats = os.stat(key)
+        except OSError:
+            return ImageHash.create_file_hash(key)
+        return _cache_name_for(key, stats.st_size, stats.st_mtime_ns)
+        
+    def _size_dir(self, size: Tuple[int, int]) -> Path:
+        """Get the directory holding thumbnails generated at a size"""
+        return self.thumbnail_dir / f"{size[0]}x{size[1]}"
+        
+    def _get_cache_path(self, key: str, size: Optional[Tuple[int, int]] = None) -> Path:
+        """Get the thumbnail path for a key inside its shard directory
+        
+        The name already changes with the source's size and mtime, so an
+        existing file is always up to date with the image. Sizes other than
+        max_size are scaled variants kept in their own size directory.
+        """
+        name = self._get_cache_name(key)
+        size_dir = self._size_dir(size) if size and size != self.max_size else self.size_dir
+        return size_dir / name[:2] / f"{name}.jpg"
+        
+    def _remove_legacy_entries(self) -> None:
+        """Delete shards written before thumbnails were grouped by size"""
+        try:
+            legacy = [path for path in self.thumbnail_dir.iterdir()
+                      if not SIZE_DIR_PATTERN.fullmatch(path.name)]
+            if legacy:
+                with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                    list(executor.map(self._remove_cache_entry, legacy))
+        except Exception as e:
+            logger.error(f"Error removing legacy thumbnails: {e}")
         
     def _add_to_memory_cache(self, cache_key: Tuple[str, Optional[Tuple[int, int]]], image: QImage) -> None:
         """Add to memory cache with LRU eviction"""
         try:
+            # Deep copy for thread safety, made before taking the lock so
+            # readers aren't blocked on the pixel memcpy
+            image = image.copy()
+            
             with self.memory_cache_lock:
                 # Remove oldest if at capacity
                 while len(self.memory_cache) >= self.memory_cache_size:
                     self.memory_cache.popitem(last=False)
                     
-                # Add new item (create a deep copy to ensure thread safety)
-                self.memory_cache[cache_key] = image.copy()
+                # Add new item
+                self.memory_cache[cache_key] = image
                 
         except Exception as e:
             logger.error(f"Error adding to memory cache: {e}")
@@ -157,6 +207,7 @@ class ThumbnailCache(QObject):
             
             # Clean up worker pool
             self.worker_pool.cleanup()
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
             
             # Clear memory cache and pending requests
             with self.memory_cache_lock:
@@ -175,19 +226,33 @@ class ThumbnailCache(QObject):
             logger.debug("Starting cache clear")
             self.cleanup()  # Stop processing first
             
-            # Clear directories
-            for file in self.thumbnail_dir.glob('*'):
-                if file.is_file():
-                    try:
-                        file.unlink()
-                    except Exception as e:
-                        logger.error(f"Error deleting cache file {file}: {e}")
+            # Clear shard directories of every size concurrently (and any
+            # stray files), then the emptied size directories
+            entries = []
+            for path in self.thumbnail_dir.iterdir():
+                entries.extend(path.iterdir() if path.is_dir() else [path])
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                list(executor.map(self._remove_cache_entry, entries))
+            for path in self.thumbnail_dir.iterdir():
+                self._remove_cache_entry(path)
+            self._shard_dirs.clear()
                         
             logger.debug("Completed cache clear")
             
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
             
+    @staticmethod
+    def _remove_cache_entry(path: Path) -> None:
+        """Delete a shard directory or a stray cache file"""
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except Exception as e:
+            logger.error(f"Error deleting cache entry {path}: {e}")
+            
     def __del__(self):
         """Ensure cleanup on deletion"""
         try:
@@ -209,34 +274,103 @@ class ThumbnailCache(QObject):
                         self.memory_cache[cache_key] = image
                         return image
                     
-            # Check disk cache
-            cache_path = self.thumbnail_dir / f"{self._get_cache_name(key)}.jpg"
-            if cache_path.exists() and cache_path.stat().st_size > 0:
-                try:
-                    if image := load_qimage(str(cache_path)):
-                        # Scale if needed
-                        if size and size != self.max_size:
-                            if scaled := scale_qimage(image, size):
-                                # Add to memory cache
-                                self._add_to_memory_cache(cache_key, scaled)
-                                return scaled
-                        else:
-                            # Add to memory cache
-                            self._add_to_memory_cache(cache_key, image)
-                            return image
-                        
-                    # Invalid thumbnail
-                    cache_path.unlink(missing_ok=True)
-                except Exception:
-                    logger.warning(f"Invalid thumbnail for {key}, removing")
-                    cache_path.unlink(missing_ok=True)
-                    
-            return None
+            return self._get_from_disk(key, size)
             
         except Exception as e:
             logger.error(f"Error getting thumbnail for {key}: {e}")
             return None
+            
+    def get_many(self, keys: List[str], size: Optional[tuple[int, int]] = None) -> Dict[str, Optional[QImage]]:
+        """Get thumbnails for several keys, taking the memory cache lock once"""
+        results = {}
+        try:
+            misses = []
+            with self.memory_cache_lock:
+                for key in keys:
+                    cache_key = (key, size) if size else (key, self.max_size)
+                    image = self.memory_cache.get(cache_key)
+                    if image is not None and is_valid_qimage(image):
+                        # Move to end (most recently used)
+                        self.memory_cache.move_to_end(cache_key)
+                        results[key] = image
+                    else:
+                        misses.append(key)
+                        
+            # Fall back to disk cache for memory misses
+            for key in misses:
+                results[key] = self._get_from_disk(key, size)
+                
+        except Exception as e:
+            logger.error(f"Error getting thumbnails: {e}")
+        return results
+        
+    def _get_from_disk(self, key: str, size: Optional[tuple[int, int]] = None) -> Optional[QImage]:
+        """Load a thumbnail from the disk cache into the memory cache"""
+        cache_key = (key, size) if size else (key, self.max_size)
+        
+        # Scaled variants are stored once rather than rescaled per request
+        if size and size != self.max_size:
+            variant_path = self._get_cache_path(key, size)
+            if variant_path.exists() and variant_path.stat().st_size > 0:
+                if image := load_qimage(str(variant_path)):
+                    self._add_to_memory_cache(cache_key, image)
+                    return image
+                variant_path.unlink(missing_ok=True)
+                
+        cache_path = self._get_cache_path(key)
+        if cache_path.exists() and cache_path.stat().st_size > 0:
+            try:
+                if image := load_qimage(str(cache_path)):
+                    # Scale if needed
+                    if size and size != self.max_size:
+                        if scaled := scale_qimage(image, size):
+                            self._save_variant(self._get_cache_path(key, size), scaled)
+                            # Add to memory cache
+                            self._add_to_memory_cache(cache_key, scaled)
+                            return scaled
+                    else:
+                        # Add to memory cache
+                        self._add_to_memory_cache(cache_key, image)
+                        return image
+                    
+                # Invalid thumbnail
+                cache_path.unlink(missing_ok=True)
+            except Exception:
+                logger.warning(f"Invalid thumbnail for {key}, removing")
+                cache_path.unlink(missing_ok=True)
+                
+        return None
 
+    def prefetch(self, keys: List[str]) -> None:
+        """Ask the kernel to read cached thumbnails ahead of their use
+        
+        Only issues readahead hints (posix_fadvise WILLNEED), so it costs no
+        decoding and returns immediately; missing thumbnails are skipped.
+        """
+        if not hasattr(os, 'posix_fadvise'):  # Not available on Windows/macOS
+            return
+        for key in keys:
+            try:
+                fd = os.open(self._get_cache_path(key), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError as e:
+                logger.debug(f"Error prefetching thumbnail for {key}: {e}")
+            finally:
+                os.close(fd)
+                
+    def _save_variant(self, variant_path: Path, image: QImage) -> None:
+        """Write a scaled thumbnail next to the other thumbnails of its size"""
+        try:
+            if variant_path.parent not in self._shard_dirs:
+                variant_path.parent.mkdir(parents=True, exist_ok=True)
+                self._shard_dirs.add(variant_path.parent)
+            save_qimage(image, variant_path)
+        except Exception as e:
+            logger.error(f"Error saving scaled thumbnail {variant_path}: {e}")
+            
     def put(self, image_path: str, original_path: str, priority: bool = False) -> None:
         """Queue thumbnail generation using worker pool"""
         try:
@@ -258,4 +392,28 @@ class ThumbnailCache(QObject):
         except Exception as e:
             logger.error(f"Error queueing thumbnail generation: {e}")
             with self.pending_lock:
-                self.pending_requests.pop(original_path, None) 
\ No newline at end of file
+                self.pending_requests.pop(original_path, None)
+                
+    def put_many(self, paths: List[str], priority: bool = False) -> None:
+        """Queue thumbnail generation for several images, taking each lock once"""
+        queued = []
+        try:
+            # Skip images already in memory cache
+            with self.memory_cache_lock:
+                paths = [path for path in paths if (path, self.max_size) not in self.memory_cache]
+                
+            # Skip images already pending
+            with self.pending_lock:
+                queued = [path for path in dict.fromkeys(paths) if path not in self.pending_requests]
+                for path in queued:
+                    self.pending_requests[path] = True
+                    
+            # Queue for processing
+            for path in queued:
+                self.worker_pool.put((path, path), priority=priority)
+                
+        except Exception as e:
+            logger.error(f"Error queueing thumbnail generation: {e}")
+            with self.pending_lock:
+                for path in queued:
+                    self.pending_requests.pop(path, None)
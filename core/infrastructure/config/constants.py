@@ -14,6 +14,9 @@ DEFAULT_PATHS = {
     'collections': 'user_data/collections'
 }
 
+# Folder saved and made default on first run, if set and present
+DEFAULT_UPLOAD_FOLDER = os.getenv('INVOKEGALLERY_DEFAULT_UPLOAD')
+
 # Application settings
 APP_NAME = "ID:I/O VIEW"
 APP_VERSION = "1.0.0"
@@ -25,10 +28,11 @@ THUMBNAIL_PADDING = 10
 SCROLL_BAR_WIDTH = 15
 
 # File extensions
-IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
 
 __all__ = [
     'DEFAULT_PATHS',
+    'DEFAULT_UPLOAD_FOLDER',
     'APP_NAME',
     'APP_VERSION',
     'APP_AUTHOR',
@@ -1,32 +1,68 @@
-import json
 import os
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from .user_config import UserConfigManager
+from .constants import DEFAULT_UPLOAD_FOLDER
+from ..utils.json_utils import json_loads, json_dumps
+from ..utils.file_utils import atomic_write_bytes
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # Optional; load_settings falls back to a stat check
+    Observer = None
 
 logger = logging.getLogger(__name__)
 
+class _SettingsFileWatch:
+    """watchdog event handler marking a manager dirty when its file changes"""
+    
+    def __init__(self, manager: 'SavedFoldersManager'):
+        self.manager = manager
+        self.path = os.path.abspath(manager.settings_file)
+        
+    def dispatch(self, event) -> None:
+        paths = (event.src_path, getattr(event, 'dest_path', None))
+        if any(p and os.path.abspath(os.fsdecode(p)) == self.path for p in paths):
+            self.manager._dirty = True
+
+@lru_cache(maxsize=8)
+def _parse_settings(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a settings file; the stat fields key the cache so edits reparse"""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
 class DefaultFolderManager:
     """Manages default folder functionality"""
     
+    # Set once the default upload folder has been set up in this process
+    _default_ensured = False
+    
     def __init__(self, parent_manager):
         self.parent = parent_manager
         self.default_folder: Optional[str] = None
         logger.debug("DefaultFolderManager initialized")
-        
-        # Set up default upload folder if no default exists
-        self._ensure_default_upload_folder()
+        # The default upload folder is set up by load_from_data(), once the
+        # parent manager is fully constructed
         
     def _ensure_default_upload_folder(self):
         """Ensure the default upload folder is set up"""
         try:
-            default_path = r"C:\Users\Mitchell\Desktop\Temp Upload Folder"
+            default_path = DEFAULT_UPLOAD_FOLDER
+            if default_path is None or DefaultFolderManager._default_ensured:
+                return
             if not self.default_folder and not self.parent.user_config.settings.default_directory:
                 logger.debug("No default folder set, setting up default upload folder")
                 if os.path.exists(default_path):
                     self.setup_folder("Default Upload Folder", default_path)
-                    logger.debug(f"Default upload folder set to: {default_path}")
+                    # Only stop checking once the setup actually took
+                    if self.default_folder == default_path:
+                        DefaultFolderManager._default_ensured = True
+                        logger.debug("Default upload folder set to: %s", default_path)
                 else:
                     logger.warning(f"Default upload folder path does not exist: {default_path}")
         except Exception as e:
@@ -35,70 +71,71 @@ class DefaultFolderManager:
     def load_from_data(self, data: dict):
         """Load default folder from data dictionary"""
         self.default_folder = data.get("default_folder")
-        logger.debug(f"Loaded default folder from data: {self.default_folder}")
+        logger.debug("Loaded default folder from data: %s", self.default_folder)
         # Ensure default folder exists after loading
         self._ensure_default_upload_folder()
         
     def save_to_data(self, data: dict):
         """Save default folder to data dictionary"""
         data["default_folder"] = self.default_folder
-        logger.debug(f"Saved default folder to data: {self.default_folder}")
+        logger.debug("Saved default folder to data: %s", self.default_folder)
         
     def set_folder(self, path: Optional[str]):
         """Set or clear the default folder"""
         try:
-            logger.debug(f"Setting default folder to: {path}")
+            logger.debug("Setting default folder to: %s", path)
             # Validate path exists in saved folders if setting
-            if path is not None and not any(p == path for p in self.parent.saved_folders.values()):
+            if path is not None and not self.parent.has_saved_path(path):
                 logger.error(f"Cannot set default folder - path not in saved folders: {path}")
                 return
                 
-            self.default_folder = path
-            # Also update the user config default directory
-            self.parent.user_config.settings.default_directory = path if path else ""
-            self.parent.user_config.save_settings()
-            self.parent.save_settings()
-            logger.debug(f"Default folder set to: {self.default_folder}")
+            # Also update the user config default directory; each file is
+            # rewritten only if its value changed
+            settings = self.parent.user_config.settings
+            if settings.default_directory != (path or ""):
+                settings.default_directory = path or ""
+                self.parent.user_config.save_settings()
+            if self.default_folder != path:
+                self.default_folder = path
+                self.parent.save_settings()
+            logger.debug("Default folder set to: %s", self.default_folder)
                 
-        except Exception as e:
+        except OSError as e:
             logger.error(f"Error setting default folder: {e}")
             
     def get_folder(self) -> Optional[str]:
         """Get the default folder path"""
-        try:
-            logger.debug("Getting default folder")
-            # First check our saved default
-            if self.default_folder and any(p == self.default_folder for p in self.parent.saved_folders.values()):
-                logger.debug(f"Returning saved default folder: {self.default_folder}")
-                return self.default_folder
-                
-            # Then check user config default directory
-            default_dir = self.parent.user_config.settings.default_directory
-            if default_dir and any(p == default_dir for p in self.parent.saved_folders.values()):
-                logger.debug(f"Returning user config default directory: {default_dir}")
-                return default_dir
-                
-            # Fall back to last directory from user config
-            last_dir = self.parent.user_config.settings.last_directory
-            logger.debug(f"Falling back to last directory: {last_dir}")
-            return last_dir
+        logger.debug("Getting default folder")
+        # First check our saved default
+        if self.default_folder and self.parent.has_saved_path(self.default_folder):
+            logger.debug("Returning saved default folder: %s", self.default_folder)
+            return self.default_folder
             
-        except Exception as e:
-            logger.error(f"Error getting default folder: {e}")
-            return None
+        # Then check user config default directory
+        default_dir = self.parent.user_config.settings.default_directory
+        if default_dir and self.parent.has_saved_path(default_dir):
+            logger.debug("Returning user config default directory: %s", default_dir)
+            return default_dir
             
+        # Fall back to last directory from user config
+        last_dir = self.parent.user_config.settings.last_directory
+        logger.debug("Falling back to last directory: %s", last_dir)
+        return last_dir
+        
     def setup_folder(self, name: str, path: str):
         """Add a folder and set it as default in one operation"""
         try:
-            logger.debug(f"Setting up default folder - name: {name}, path: {path}")
-            # First add the folder if it's not already saved
-            if not any(p == path for p in self.parent.saved_folders.values()):
-                logger.debug("Adding folder to saved folders")
-                self.parent.add_saved_folder(name, path)
-                
-            # Then set it as default
-            logger.debug("Setting as default folder")
-            self.set_folder(path)
+            logger.debug("Setting up default folder - name: %s, path: %s", name, path)
+            # Add and set as default with a single write of saved_folders.json
+            with self.parent.batched_save():
+                # First add the folder if it's not already saved
+                if not self.parent.has_saved_path(path):
+                    logger.debug("Adding folder to saved folders")
+                    self.parent.add_saved_folder(name, path)
+                    
+                # Then set it as default
+                logger.debug("Setting as default folder")
+                self.set_folder(path)
                 
         except Exception as e:
             logger.error(f"Error setting up default folder: {e}")
@@ -110,55 +147,120 @@ class SavedFoldersManager:
         self.user_config = user_config
         self.settings_file = user_config.config_dir / "saved_folders.json"
         self.saved_folders: Dict[str, str] = {}  # name -> path mapping
+        self._path_counts: Counter = Counter()  # path -> number of names saving it
+        self._save_depth = 0  # Nesting level of batched_save()
+        self._save_pending = False
+        self._last_stat: Optional[tuple] = None  # (mtime_ns, size) of the loaded file
+        self._recent_cache: Optional[Tuple[list, Tuple[str, ...]]] = None  # (source list, snapshot)
+        self._dirty = True  # Cleared between change notifications when watching
+        self._observer = self._start_watcher()
         self.default = DefaultFolderManager(self)
-        logger.debug(f"SavedFoldersManager initialized with settings file: {self.settings_file}")
+        logger.debug("SavedFoldersManager initialized with settings file: %s", self.settings_file)
         self.load_settings()
         
+    def _start_watcher(self):
+        """Watch the settings file for changes when watchdog is installed"""
+        if Observer is None:
+            return None
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_SettingsFileWatch(self), str(self.settings_file.parent), recursive=False)
+            observer.start()
+            return observer
+        except Exception as e:
+            logger.error(f"Error watching settings file: {e}")
+            return None
+        
     def load_settings(self):
         """Load saved folders from settings file"""
         try:
-            logger.debug(f"Loading settings from {self.settings_file}")
-            if self.settings_file.exists():
+            logger.debug("Loading settings from %s", self.settings_file)
+            if self._observer and not self._dirty and self._last_stat is not None:
+                logger.debug("No change notifications since last load")
+                return
+            # Cleared before reading so a change during the load isn't lost
+            self._dirty = False
+            
+            try:
+                st = os.stat(self.settings_file)
+            except FileNotFoundError:
+                st = None
+                
+            if st is not None:
                 logger.debug("Settings file exists")
-                with open(self.settings_file) as f:
-                    data = json.load(f)
-                    self.saved_folders = data.get("saved_folders", {})
-                    logger.debug(f"Loaded saved folders: {self.saved_folders}")
-                    self.default.load_from_data(data)
+                stamp = (st.st_mtime_ns, st.st_size)
+                if stamp == self._last_stat:
+                    logger.debug("Settings file unchanged since last load")
+                    return
+                    
+                # The parsed dict is shared by the cache, so copy what we keep
+                data = dict(_parse_settings(str(self.settings_file), *stamp))
+                self.saved_folders = dict(data.get("saved_folders", {}))
+                self._path_counts = Counter(self.saved_folders.values())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Loaded saved folders: %s", self.saved_folders)
+                self.default.load_from_data(data)
+                self._last_stat = stamp
             else:
                 logger.debug("Settings file does not exist, initializing with empty data")
                 self.saved_folders = {}
+                self._path_counts.clear()
                 self.default.default_folder = None
                 # This will trigger the default folder setup
                 self.default.load_from_data({})
                 self.save_settings()
                 
-        except Exception as e:
+        except (OSError, ValueError) as e:  # ValueError covers JSONDecodeError
             logger.error(f"Error loading saved folders: {e}")
             self.saved_folders = {}
+            self._path_counts.clear()
             self.default.default_folder = None
             # Attempt to set up default folder even in error case
             self.default.load_from_data({})
             
+    @contextmanager
+    def batched_save(self):
+        """Defer save_settings() calls in the block to one write at the end"""
+        self._save_depth += 1
+        try:
+            yield
+        finally:
+            self._save_depth -= 1
+            if self._save_depth == 0 and self._save_pending:
+                self.save_settings()
+                
     def save_settings(self):
         """Save current settings to file"""
+        if self._save_depth:
+            self._save_pending = True
+            return
+        self._save_pending = False
         try:
-            logger.debug(f"Saving settings to {self.settings_file}")
+            logger.debug("Saving settings to %s", self.settings_file)
             data = {"saved_folders": self.saved_folders}
             self.default.save_to_data(data)
             
-            with open(self.settings_file, 'w') as f:
-                json.dump(data, f, indent=4)
-            logger.debug(f"Settings saved successfully: {data}")
+            atomic_write_bytes(self.settings_file, json_dumps(data, indent=True))
+            # What's on disk now matches memory, so a reload can be skipped
+            st = os.stat(self.settings_file)
+            self._last_stat = (st.st_mtime_ns, st.st_size)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Settings saved successfully: %s", data)
                 
-        except Exception as e:
+        except (OSError, TypeError) as e:
             logger.error(f"Error saving folders: {e}")
             
     def add_saved_folder(self, name: str, path: str):
         """Add a folder to saved folders"""
         try:
-            logger.debug(f"Adding saved folder - name: {name}, path: {path}")
+            logger.debug("Adding saved folder - name: %s, path: %s", name, path)
+            if self.saved_folders.get(name) == path:
+                return
+            if name in self.saved_folders:
+                self._forget_path(self.saved_folders[name])
             self.saved_folders[name] = path
+            self._path_counts[path] += 1
             self.save_settings()
             logger.debug("Folder added successfully")
                 
@@ -168,54 +270,74 @@ class SavedFoldersManager:
     def remove_saved_folder(self, name: str):
         """Remove a folder from saved folders"""
         try:
-            logger.debug(f"Removing saved folder: {name}")
+            logger.debug("Removing saved folder: %s", name)
             if name in self.saved_folders:
-                # If this was the default folder, clear it
-                if self.saved_folders[name] == self.default.default_folder:
-                    logger.debug("Clearing default folder as it's being removed")
-                    self.default.set_folder(None)
-                del self.saved_folders[name]
-                self.save_settings()
+                with self.batched_save():
+                    # If this was the default folder, clear it
+                    if self.saved_folders[name] == self.default.default_folder:
+                        logger.debug("Clearing default folder as it's being removed")
+                        self.default.set_folder(None)
+                    self._forget_path(self.saved_folders.pop(name))
+                    self.save_settings()
                 logger.debug("Folder removed successfully")
                 
         except Exception as e:
             logger.error(f"Error removing saved folder: {e}")
             
+    def has_saved_path(self, path: str) -> bool:
+        """Check whether any saved folder points at a path"""
+        return path in self._path_counts
+        
+    def _forget_path(self, path: str):
+        """Drop one saved folder's reference to a path"""
+        self._path_counts[path] -= 1
+        if self._path_counts[path] <= 0:
+            del self._path_counts[path]
+            
     def add_recent_folder(self, folder: str):
         """Add a folder to recent folders"""
-        logger.debug(f"Adding to recent folders: {folder}")
+        logger.debug("Adding to recent folders: %s", folder)
         self.user_config.add_recent_directory(folder)
+        self._recent_cache = None
             
-    def get_saved_folders(self) -> Dict[str, str]:
-        """Get dictionary of saved folders (name -> path)"""
-        logger.debug(f"Getting saved folders: {self.saved_folders}")
+    def get_saved_folders(self) -> Mapping[str, str]:
+        """Get a read-only view of saved folders (name -> path)"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Getting saved folders: %s", self.saved_folders)
+        return MappingProxyType(self.saved_folders)
+        
+    def get_saved_folders_copy(self) -> Dict[str, str]:
+        """Get a mutable copy of saved folders (name -> path)"""
         return self.saved_folders.copy()
         
-    def get_recent_folders(self) -> List[str]:
-        """Get list of recent folders"""
-        recent = self.user_config.settings.recent_directories.copy()
-        logger.debug(f"Getting recent folders: {recent}")
+    def get_recent_folders(self) -> Tuple[str, ...]:
+        """Get recent folders as a tuple, rebuilt only when the list changes"""
+        source = self.user_config.settings.recent_directories
+        if self._recent_cache is None or self._recent_cache[0] is not source:
+            self._recent_cache = (source, tuple(source))
+        recent = self._recent_cache[1]
+        logger.debug("Getting recent folders: %s", recent)
         return recent
         
     def get_last_directory(self) -> Optional[str]:
         """Get last accessed directory"""
         last_dir = self.user_config.settings.last_directory
-        logger.debug(f"Getting last directory: {last_dir}")
+        logger.debug("Getting last directory: %s", last_dir)
         return last_dir
         
     # For backward compatibility and easier migration
     def set_default_folder(self, path: Optional[str]):
         """Set or clear the default folder (compatibility method)"""
-        logger.debug(f"Setting default folder (compatibility): {path}")
+        logger.debug("Setting default folder (compatibility): %s", path)
         self.default.set_folder(path)
             
     def get_default_folder(self) -> Optional[str]:
         """Get the default folder path (compatibility method)"""
         folder = self.default.get_folder()
-        logger.debug(f"Getting default folder (compatibility): {folder}")
+        logger.debug("Getting default folder (compatibility): %s", folder)
         return folder
         
     def setup_default_folder(self, name: str, path: str):
         """Add a folder and set it as default (compatibility method)"""
-        logger.debug(f"Setting up default folder (compatibility) - name: {name}, path: {path}")
+        logger.debug("Setting up default folder (compatibility) - name: %s, path: %s", name, path)
         self.default.setup_folder(name, path)
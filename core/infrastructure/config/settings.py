@@ -2,17 +2,27 @@
 
 import os
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
-import json
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, Set
 import logging
 from .user_config import UserConfigManager
 from .savedfolders import SavedFoldersManager
 
 from .constants import DEFAULT_PATHS, THUMBNAIL_SIZE
+from ..utils.json_utils import json_loads, json_dumps
+from ..utils.file_utils import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Parsed once; Path objects are immutable, so instances can share them
+_DEFAULT_PATH_OBJS = {name: Path(path) for name, path in DEFAULT_PATHS.items()}
+
+# AppSettings fields holding paths, as stored in the settings file
+_PATH_KEYS = (
+    'base_dir', 'images_dir', 'thumbnails_dir', 'collections_dir',
+    'favorites_dir', 'boards_dir', 'cache_dir', 'config_dir'
+)
+
 @dataclass
 class AppSettings:
     """Application settings with environment variable support"""
@@ -23,13 +33,13 @@ class AppSettings:
     ))
     
     # Subdirectories - all relative to base_dir
-    images_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['images']))
-    thumbnails_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['thumbnails']))
-    collections_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['collections']))
-    favorites_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['favorites']))
-    boards_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['boards']))
-    cache_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['cache']))
-    config_dir: Path = field(default_factory=lambda: Path(DEFAULT_PATHS['config']))
+    images_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['images'])
+    thumbnails_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['thumbnails'])
+    collections_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['collections'])
+    favorites_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['favorites'])
+    boards_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['boards'])
+    cache_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['cache'])
+    config_dir: Path = field(default_factory=lambda: _DEFAULT_PATH_OBJS['config'])
     
     # Cache settings
     cache_enabled: bool = True
@@ -41,37 +51,55 @@ class AppSettings:
     thumbnail_size: int = THUMBNAIL_SIZE
     default_view: str = "grid"
     
+    # Directories already created this session
+    _ensured: Set[Path] = field(default_factory=set, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Ensure all paths are relative to base_dir"""
         # Make paths absolute relative to base_dir if they're not already absolute
-        for path_attr in ['images_dir', 'thumbnails_dir', 'collections_dir',
-                         'favorites_dir', 'boards_dir', 'cache_dir', 'config_dir']:
-            path = getattr(self, path_attr)
-            if not path.is_absolute():
-                setattr(self, path_attr, self.base_dir / path)
+        base = self.base_dir
+        if not self.images_dir.is_absolute():
+            self.images_dir = base / self.images_dir
+        if not self.thumbnails_dir.is_absolute():
+            self.thumbnails_dir = base / self.thumbnails_dir
+        if not self.collections_dir.is_absolute():
+            self.collections_dir = base / self.collections_dir
+        if not self.favorites_dir.is_absolute():
+            self.favorites_dir = base / self.favorites_dir
+        if not self.boards_dir.is_absolute():
+            self.boards_dir = base / self.boards_dir
+        if not self.cache_dir.is_absolute():
+            self.cache_dir = base / self.cache_dir
+        if not self.config_dir.is_absolute():
+            self.config_dir = base / self.config_dir
     
     @classmethod
     def load_from_file(cls, config_path: Path) -> 'AppSettings':
         """Load settings from a JSON configuration file"""
         try:
-            if config_path.exists():
-                with open(config_path) as f:
-                    data = json.load(f)
-                    
-                # Convert path strings to Path objects
-                path_keys = [
-                    'base_dir', 'images_dir', 'thumbnails_dir', 'collections_dir',
-                    'favorites_dir', 'boards_dir', 'cache_dir', 'config_dir'
-                ]
+            # Read directly rather than exists() first; a missing file is the
+            # first-run case and goes straight to the defaults
+            raw = config_path.read_bytes()
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            logger.error(f"Error reading settings from {config_path}: {e}")
+            return cls()
+            
+        try:
+            data = json_loads(raw)
+            
+            # Fill missing path keys from defaults and convert path strings
+            # to Path objects
+            defaults = None
+            for key in _PATH_KEYS:
+                if key not in data:
+                    defaults = defaults or cls()  # Built once, only if needed
+                    data[key] = getattr(defaults, key)  # Already a Path
+                elif isinstance(data[key], str):
+                    data[key] = Path(data[key])
                 
-                # Ensure all path keys exist with default values if not in data
-                for key in path_keys:
-                    if key not in data:
-                        data[key] = str(getattr(cls(), key))  # Get default from class
-                    if isinstance(data[key], str):  # Only convert if it's a string
-                        data[key] = Path(data[key])
-                    
-                return cls(**data)
+            return cls(**data)
             
         except Exception as e:
             logger.error(f"Error loading settings from {config_path}: {e}")
@@ -82,62 +110,64 @@ class AppSettings:
     def save_to_file(self, config_path: Path) -> None:
         """Save settings to a JSON configuration file"""
         try:
-            # Convert paths to strings for JSON serialization
-            data = {
-                'base_dir': str(self.base_dir),
-                'images_dir': str(self.images_dir),
-                'thumbnails_dir': str(self.thumbnails_dir),
-                'collections_dir': str(self.collections_dir),
-                'favorites_dir': str(self.favorites_dir),
-                'boards_dir': str(self.boards_dir),
-                'cache_dir': str(self.cache_dir),
-                'config_dir': str(self.config_dir),
-                'cache_enabled': self.cache_enabled,
-                'max_cache_size_mb': self.max_cache_size_mb,
-                'cache_ttl_days': self.cache_ttl_days,
-                'theme': self.theme,
-                'thumbnail_size': self.thumbnail_size,
-                'default_view': self.default_view
-            }
+            # Every constructor field; paths are written as strings
+            data = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
             
             # Create parent directories if they don't exist
             config_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(config_path, 'w') as f:
-                json.dump(data, f, indent=4)
+            atomic_write_bytes(config_path, json_dumps(data, indent=True, default=str))
                 
         except Exception as e:
             print(f"Error saving settings: {e}")
             
     def ensure_directories(self) -> None:
         """Ensure all required directories exist"""
-        # Create all required directories
-        for path in [self.base_dir, self.images_dir, self.thumbnails_dir,
-                    self.collections_dir, self.favorites_dir, self.boards_dir,
-                    self.cache_dir, self.config_dir]:
+        # Create all required directories, shallowest first so each mkdir
+        # finds its parent already in place
+        paths = {self.base_dir, self.images_dir, self.thumbnails_dir,
+                 self.collections_dir, self.favorites_dir, self.boards_dir,
+                 self.cache_dir, self.config_dir}
+        for path in sorted(paths, key=lambda p: len(p.parts)):
+            self._ensure_dir(path)
+            
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a directory unless it was already created this session"""
+        if path not in self._ensured:
             path.mkdir(parents=True, exist_ok=True)
+            self._ensured.add(path)
+            self._ensured.update(path.parents)
             
     def validate_paths(self) -> Dict[str, bool]:
-        """Validate existence of configured paths"""
-        return {
-            'base_dir': self.base_dir.exists(),
-            'images_dir': self.images_dir.exists(),
-            'thumbnails_dir': self.thumbnails_dir.exists(),
-            'collections_dir': self.collections_dir.exists(),
-            'favorites_dir': self.favorites_dir.exists(),
-            'boards_dir': self.boards_dir.exists(),
-            'cache_dir': self.cache_dir.exists(),
-            'config_dir': self.config_dir.exists()
-        }
+        """Validate existence of configured paths
+        
+        Paths are grouped by parent directory and each parent is listed
+        once, instead of one stat per path. Names missing from a listing
+        are confirmed with a stat, which covers '.', '..', the root and
+        case-insensitive filesystems.
+        """
+        listings: Dict[Path, Set[str]] = {}
+        result = {}
+        for key in _PATH_KEYS:
+            path = getattr(self, key)
+            parent = path.parent
+            if parent not in listings:
+                try:
+                    with os.scandir(parent) as it:
+                        listings[parent] = {entry.name for entry in it}
+                except OSError:
+                    listings[parent] = set()
+            result[key] = path.name in listings[parent] or path.exists()
+        return result
         
     def get_images_dir(self) -> Path:
         """Get the configured images directory, ensuring it exists"""
-        self.images_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.images_dir)
         return self.images_dir
         
     def get_favorites_dir(self) -> Path:
         """Get the configured favorites directory, ensuring it exists"""
-        self.favorites_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.favorites_dir)
         return self.favorites_dir
 
 class AppSettingsManager:
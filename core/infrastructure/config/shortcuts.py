@@ -1,11 +1,14 @@
 """Keyboard shortcuts configuration"""
 
 from typing import Optional, Dict, Callable, Any
-import json
+import os
+from functools import lru_cache, partial
+from types import MappingProxyType
 from pathlib import Path
 import logging
 from PyQt6.QtGui import QShortcut, QKeyEvent
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 
 
 from interface.qt.shared.imports import (
@@ -14,18 +17,152 @@ from interface.qt.shared.imports import (
     
     # Widget imports
     QDialog, QLabel, QHBoxLayout, QVBoxLayout, 
-    QPushButton, QGroupBox, QLineEdit
+    QPushButton, QGroupBox, QLineEdit, QTabWidget, QWidget
 )
 
 from interface.qt.views.browser.fullscreen_view import FullScreenViewer
 from core.infrastructure.persistence.local_image_repository import LocalImageRepository
+from core.infrastructure.utils.json_utils import json_loads, json_dumps
+from core.infrastructure.utils.file_utils import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Grid navigation directions handled by GridView.navigate, as (dx, dy)
+_NAV_TABLE = {
+    "left": (-1, 0),
+    "right": (1, 0),
+    "up": (0, -1),
+    "down": (0, 1),
+}
+
+# Grid navigation directions handled by GridView.navigate_to_position
+_POS_TABLE = frozenset({"first", "last", "page_up", "page_down"})
+
+# Delay before customized shortcuts are written, so a burst of edits
+# produces one write
+SAVE_DEBOUNCE_MS = 250
+
+# Dialog stylesheets, set once on each dialog and inherited by its
+# sections, so Qt parses a single sheet per dialog instead of one per widget
+_GROUPBOX_QSS = """
+    QGroupBox {
+        color: white;
+        border: 1px solid #555555;
+        border-radius: 5px;
+        margin-top: 1em;
+        padding-top: 1em;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 3px;
+    }
+    QTabWidget::pane {
+        border: 1px solid #555555;
+    }
+    QTabBar::tab {
+        background-color: #2d2d2d;
+        color: white;
+        padding: 5px 10px;
+    }
+    QTabBar::tab:selected {
+        background-color: #0078d4;
+    }
+"""
+
+_DIALOG_QSS = """
+    QDialog {
+        background-color: #1e1e1e;
+        color: white;
+    }
+    QLabel {
+        color: white;
+    }
+    QLabel#shortcutKey {
+        color: #2997ff;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        border: none;
+        border-radius: 5px;
+        padding: 5px 15px;
+        color: white;
+    }
+    QPushButton:hover {
+        background-color: #2997ff;
+    }
+""" + _GROUPBOX_QSS
+
+_CUSTOMIZE_QSS = """
+    QDialog {
+        background-color: #1e1e1e;
+        color: white;
+        min-width: 500px;
+    }
+    QLabel {
+        color: white;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        border: none;
+        border-radius: 5px;
+        padding: 5px 15px;
+        color: white;
+        min-width: 80px;
+    }
+    QPushButton:hover {
+        background-color: #2997ff;
+    }
+    QPushButton:disabled {
+        background-color: #555555;
+    }
+    QLineEdit {
+        background-color: #2d2d2d;
+        color: white;
+        border: 1px solid #555555;
+        border-radius: 3px;
+        padding: 5px;
+    }
+    QLineEdit:focus {
+        border-color: #0078d4;
+    }
+""" + _GROUPBOX_QSS
+
+@lru_cache(maxsize=4)
+def _parse_shortcuts(path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse a shortcuts file once per version, shared by all ShortcutConfigs"""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+def _lazy_tab_widget(sections: list, build_section: Callable[[str, list], QWidget]) -> QTabWidget:
+    """Create one tab per (title, shortcuts) section, building its widgets
+    only when the tab is first shown"""
+    tabs = QTabWidget()
+    pages = []
+    for title, _ in sections:
+        page = QWidget()
+        QVBoxLayout(page)
+        tabs.addTab(page, title)
+        pages.append(page)
+        
+    built = set()
+    
+    def build(index: int) -> None:
+        if index < 0 or index in built:
+            return
+        built.add(index)
+        title, shortcuts = sections[index]
+        pages[index].layout().addWidget(build_section(title, shortcuts))
+        pages[index].layout().addStretch()
+        
+    tabs.currentChanged.connect(build)
+    build(tabs.currentIndex())
+    return tabs
+
 class ShortcutConfig:
     """Manages shortcut configuration and persistence"""
     
-    DEFAULT_SHORTCUTS = {
+    DEFAULT_SHORTCUTS = MappingProxyType({
         # Grid Navigation
         "grid_left": "Left",
         "grid_right": "Right",
@@ -63,69 +200,128 @@ class ShortcutConfig:
         # File operations
         "open_folder": "Ctrl+O",
         "save_changes": "Ctrl+S",
-    }
+    })
+    
+    # Actions that can be customized
+    _ACTIONS = frozenset(DEFAULT_SHORTCUTS)
     
     def __init__(self, config_dir: Path):
         self.config_dir = config_dir
         self.config_file = config_dir / "shortcuts.json"
+        self._config_file_str = str(self.config_file)  # For os/open calls
+        self._dir_ensured = False
         self.shortcuts = self.DEFAULT_SHORTCUTS.copy()
-        logger.debug(f"Initializing ShortcutConfig with config_dir: {config_dir}")
-        logger.debug(f"Default shortcuts: {self.shortcuts}")
-        self.load_config()
-        
+        logger.debug("Initializing ShortcutConfig with config_dir: %s", config_dir)
+        # The config file is read on first use rather than at startup
+        self._loaded = False
+        self._last_written: Optional[Dict[str, str]] = None  # Overrides known to be on disk
+        self._seq_cache: Dict[str, QKeySequence] = {}  # action -> parsed sequence
+        
+        # Debounced writes; anything pending is flushed on quit
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self.save_config)
+        if app := QApplication.instance():
+            app.aboutToQuit.connect(self.flush)
+        
+    def _ensure_loaded(self) -> None:
+        """Load the config file if it hasn't been yet"""
+        if not self._loaded:
+            self._loaded = True
+            self.load_config()
+            
     def load_config(self) -> None:
         """Load custom shortcuts from config file"""
+        self._loaded = True
         try:
-            if self.config_file.exists():
-                logger.debug(f"Loading shortcuts from {self.config_file}")
-                with open(self.config_file, 'r') as f:
-                    custom_shortcuts = json.load(f)
-                    logger.debug(f"Loaded custom shortcuts: {custom_shortcuts}")
-                    self.shortcuts.update(custom_shortcuts)
+            try:
+                st = os.stat(self._config_file_str)
+            except FileNotFoundError:
+                st = None
+                
+            if st is not None:
+                logger.debug("Loading shortcuts from %s", self.config_file)
+                custom_shortcuts = _parse_shortcuts(self._config_file_str, st.st_mtime_ns, st.st_size)
+                logger.debug("Loaded custom shortcuts: %s", custom_shortcuts)
+                self.shortcuts.update(custom_shortcuts)
+                self._seq_cache.clear()
+                self._last_written = self._overrides()
             else:
-                logger.debug(f"No custom shortcuts file found at {self.config_file}, using defaults")
-                # Ensure the config directory exists
-                self.config_dir.mkdir(parents=True, exist_ok=True)
-                # Save the default shortcuts
-                self.save_config()
+                # Defaults live in code, so there is nothing to write yet
+                logger.debug("No custom shortcuts file found at %s, using defaults", self.config_file)
+                self._last_written = {}
         except Exception as e:
             logger.error(f"Error loading shortcut config: {e}")
             
+    def _overrides(self) -> Dict[str, str]:
+        """Get the shortcuts that differ from DEFAULT_SHORTCUTS"""
+        return {
+            action: sequence for action, sequence in self.shortcuts.items()
+            if sequence != self.DEFAULT_SHORTCUTS.get(action)
+        }
+        
     def save_config(self) -> None:
-        """Save current shortcuts to config file"""
+        """Save customized shortcuts to config file, if they changed"""
         try:
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Saving shortcuts to {self.config_file}: {self.shortcuts}")
-            with open(self.config_file, 'w') as f:
-                json.dump(self.shortcuts, f, indent=4)
+            overrides = self._overrides()
+            if overrides == self._last_written:
+                return
+            if not self._dir_ensured:
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+                self._dir_ensured = True
+            logger.debug("Saving shortcuts to %s: %s", self.config_file, overrides)
+            atomic_write_bytes(self._config_file_str, json_dumps(overrides, indent=True))
+            self._last_written = overrides
         except Exception as e:
             logger.error(f"Error saving shortcut config: {e}")
             
+    def schedule_save(self) -> None:
+        """Save after SAVE_DEBOUNCE_MS, restarting the wait on each call"""
+        self._save_timer.start()
+        
+    def flush(self) -> None:
+        """Write a pending save immediately"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_config()
+            
     def get_shortcut(self, action: str) -> str:
         """Get shortcut sequence for action"""
+        self._ensure_loaded()
         shortcut = self.shortcuts.get(action, self.DEFAULT_SHORTCUTS.get(action, ""))
-        logger.debug(f"Getting shortcut for action '{action}': {shortcut}")
         return shortcut
         
+    def get_key_sequence(self, action: str) -> QKeySequence:
+        """Get the parsed key sequence for action, parsing it once"""
+        if (sequence := self._seq_cache.get(action)) is None:
+            sequence = self._seq_cache[action] = QKeySequence(self.get_shortcut(action))
+        return sequence
+        
     def set_shortcut(self, action: str, sequence: str) -> None:
         """Set custom shortcut for action"""
-        if action in self.DEFAULT_SHORTCUTS:
-            logger.debug(f"Setting shortcut for action '{action}' to '{sequence}'")
+        self._ensure_loaded()
+        if action in self._ACTIONS:
+            logger.debug("Setting shortcut for action '%s' to '%s'", action, sequence)
             self.shortcuts[action] = sequence
-            self.save_config()
+            self._seq_cache.pop(action, None)
+            self.schedule_save()
         else:
             logger.warning(f"Attempted to set shortcut for unknown action: {action}")
             
     def reset_to_default(self, action: Optional[str] = None) -> None:
         """Reset shortcuts to default"""
+        self._ensure_loaded()
         if action:
-            if action in self.DEFAULT_SHORTCUTS:
-                logger.debug(f"Resetting shortcut for action '{action}' to default")
+            if action in self._ACTIONS:
+                logger.debug("Resetting shortcut for action '%s' to default", action)
                 self.shortcuts[action] = self.DEFAULT_SHORTCUTS[action]
+                self._seq_cache.pop(action, None)
         else:
             logger.debug("Resetting all shortcuts to defaults")
             self.shortcuts = self.DEFAULT_SHORTCUTS.copy()
-        self.save_config()
+            self._seq_cache.clear()
+        self.schedule_save()
 
 class GalleryShortcuts:
     """Manages keyboard shortcuts for the gallery application"""
@@ -138,6 +334,7 @@ class GalleryShortcuts:
         self.config = ShortcutConfig(Path("user_data/config"))
         self.shortcuts: Dict[str, QShortcut] = {}
         self.fullscreen_viewer = None  # Track current fullscreen viewer
+        self._grid_view = None  # Main window's grid view, resolved on first use
         self.setup_main_shortcuts()
         
     def setup_main_shortcuts(self):
@@ -146,14 +343,14 @@ class GalleryShortcuts:
             logger.debug("Setting up main shortcuts")
             
             # Grid navigation shortcuts
-            self._add_shortcut("grid_left", lambda: self._handle_grid_navigation("left"))
-            self._add_shortcut("grid_right", lambda: self._handle_grid_navigation("right"))
-            self._add_shortcut("grid_up", lambda: self._handle_grid_navigation("up"))
-            self._add_shortcut("grid_down", lambda: self._handle_grid_navigation("down"))
-            self._add_shortcut("grid_first", lambda: self._handle_grid_navigation("first"))
-            self._add_shortcut("grid_last", lambda: self._handle_grid_navigation("last"))
-            self._add_shortcut("grid_page_up", lambda: self._handle_grid_navigation("page_up"))
-            self._add_shortcut("grid_page_down", lambda: self._handle_grid_navigation("page_down"))
+            self._add_shortcut("grid_left", partial(self._handle_grid_navigation, "left"))
+            self._add_shortcut("grid_right", partial(self._handle_grid_navigation, "right"))
+            self._add_shortcut("grid_up", partial(self._handle_grid_navigation, "up"))
+            self._add_shortcut("grid_down", partial(self._handle_grid_navigation, "down"))
+            self._add_shortcut("grid_first", partial(self._handle_grid_navigation, "first"))
+            self._add_shortcut("grid_last", partial(self._handle_grid_navigation, "last"))
+            self._add_shortcut("grid_page_up", partial(self._handle_grid_navigation, "page_up"))
+            self._add_shortcut("grid_page_down", partial(self._handle_grid_navigation, "page_down"))
             
             # Selection shortcuts
             self._add_shortcut("select_all", self._handle_select_all)
@@ -169,60 +366,54 @@ class GalleryShortcuts:
             
             # Rating shortcuts
             for i in range(6):
-                self._add_shortcut(f"rate_{i}", lambda x=i: self.set_rating(x))
+                self._add_shortcut(f"rate_{i}", partial(self.set_rating, i))
                 
-            logger.debug(f"Shortcuts setup complete. Active shortcuts: {list(self.shortcuts.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Shortcuts setup complete. Active shortcuts: %s", list(self.shortcuts.keys()))
         except Exception as e:
             logger.error(f"Error setting up shortcuts: {e}")
 
+    def _gv(self):
+        """Get the main window's grid view, or None until it exists"""
+        if self._grid_view is None:
+            self._grid_view = getattr(self.main_window, 'grid_view', None)
+        return self._grid_view
+        
     def _handle_grid_navigation(self, direction: str) -> None:
         """Handle grid navigation shortcuts"""
         try:
-            if not hasattr(self.main_window, 'grid_view'):
+            if (grid_view := self._gv()) is None:
                 return
                 
-            grid_view = self.main_window.grid_view
             shift_held = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
             
-            if direction == "left":
-                grid_view.navigate(-1, 0, extend_selection=shift_held)
-            elif direction == "right":
-                grid_view.navigate(1, 0, extend_selection=shift_held)
-            elif direction == "up":
-                grid_view.navigate(0, -1, extend_selection=shift_held)
-            elif direction == "down":
-                grid_view.navigate(0, 1, extend_selection=shift_held)
-            elif direction == "first":
-                grid_view.navigate_to_position("first", extend_selection=shift_held)
-            elif direction == "last":
-                grid_view.navigate_to_position("last", extend_selection=shift_held)
-            elif direction == "page_up":
-                grid_view.navigate_to_position("page_up", extend_selection=shift_held)
-            elif direction == "page_down":
-                grid_view.navigate_to_position("page_down", extend_selection=shift_held)
+            if (step := _NAV_TABLE.get(direction)) is not None:
+                grid_view.navigate(*step, extend_selection=shift_held)
+            elif direction in _POS_TABLE:
+                grid_view.navigate_to_position(direction, extend_selection=shift_held)
                 
         except Exception as e:
             logger.error(f"Error handling grid navigation: {e}")
 
     def _handle_select_all(self) -> None:
         """Handle select all shortcut"""
-        if hasattr(self.main_window, 'grid_view'):
-            self.main_window.grid_view.select_all()
+        if (grid_view := self._gv()) is not None:
+            grid_view.select_all()
 
     def _handle_deselect_all(self) -> None:
         """Handle deselect all shortcut"""
-        if hasattr(self.main_window, 'grid_view'):
-            self.main_window.grid_view.deselect_all()
+        if (grid_view := self._gv()) is not None:
+            grid_view.deselect_all()
 
     def _add_shortcut(self, action: str, callback: Callable) -> None:
         """Add a shortcut with the specified action and callback"""
         sequence = self.config.get_shortcut(action)
-        logger.debug(f"Adding shortcut for action '{action}' with sequence '{sequence}'")
+        logger.debug("Adding shortcut for action '%s' with sequence '%s'", action, sequence)
         if sequence:
-            shortcut = QShortcut(QKeySequence(sequence), self.main_window)
+            shortcut = QShortcut(self.config.get_key_sequence(action), self.main_window)
             shortcut.activated.connect(callback)
             self.shortcuts[action] = shortcut
-            logger.debug(f"Shortcut added successfully for {action}")
+            logger.debug("Shortcut added successfully for %s", action)
         else:
             logger.warning(f"No sequence found for action: {action}")
             
@@ -230,9 +421,9 @@ class GalleryShortcuts:
         """Update an existing shortcut"""
         try:
             if action in self.shortcuts:
-                logger.debug(f"Updating shortcut for action '{action}' to '{sequence}'")
+                logger.debug("Updating shortcut for action '%s' to '%s'", action, sequence)
                 self.config.set_shortcut(action, sequence)
-                self.shortcuts[action].setKey(QKeySequence(sequence))
+                self.shortcuts[action].setKey(self.config.get_key_sequence(action))
             else:
                 logger.warning(f"Attempted to update non-existent shortcut: {action}")
         except Exception as e:
@@ -253,23 +444,23 @@ class GalleryShortcuts:
                 self.fullscreen_viewer = None
                 
                 # Sync grid view to last fullscreen position
-                if current_hash and hasattr(self.main_window, 'grid_view'):
-                    self.main_window.grid_view.select_by_hash(current_hash)
+                if current_hash and (grid_view := self._gv()) is not None:
+                    grid_view.select_by_hash(current_hash)
                 return
 
             # Otherwise, open fullscreen view
-            if not hasattr(self.main_window, 'grid_view'):
+            if (grid_view := self._gv()) is None:
                 logger.debug("Cannot open fullscreen: no grid view available")
                 return
                 
-            selected_images = self.main_window.grid_view.get_selected_paths()
+            selected_images = grid_view.get_selected_paths()
             if not selected_images:
                 logger.debug("Cannot open fullscreen: no images selected")
                 return
                 
             logger.debug("Opening fullscreen view")
             # Get image data from grid view
-            image_data = self.main_window.grid_view.get_current_image_data()
+            image_data = grid_view.get_current_image_data()
             
             # Create and show fullscreen viewer
             self.fullscreen_viewer = FullScreenViewer(
@@ -281,10 +472,10 @@ class GalleryShortcuts:
             )
             
             # Connect signals
-            self.fullscreen_viewer.image_deleted.connect(self.main_window.grid_view.remove_image)
+            self.fullscreen_viewer.image_deleted.connect(grid_view.remove_image)
             self.fullscreen_viewer.closed.connect(self.main_window.on_fullscreen_closed)
             self.fullscreen_viewer.image_changed.connect(
-                lambda path: self.main_window.grid_view.select_by_hash(
+                lambda path: grid_view.select_by_hash(
                     self.fullscreen_viewer.image_hashes.get(path, "")
                 )
             )
@@ -313,31 +504,31 @@ class GalleryShortcuts:
         """Apply shortcuts to fullscreen viewer"""
         try:
             # Toggle fullscreen (Space)
-            QShortcut(QKeySequence(self.config.get_shortcut("toggle_fullscreen")), 
+            QShortcut(self.config.get_key_sequence("toggle_fullscreen"), 
                      fullscreen_viewer, activated=fullscreen_viewer.close)
             
             # Exit fullscreen (Escape)
-            QShortcut(QKeySequence(self.config.get_shortcut("exit_fullscreen")), 
+            QShortcut(self.config.get_key_sequence("exit_fullscreen"), 
                      fullscreen_viewer, activated=fullscreen_viewer.close)
             
             # Navigation
-            QShortcut(QKeySequence(self.config.get_shortcut("next_image")), 
+            QShortcut(self.config.get_key_sequence("next_image"), 
                      fullscreen_viewer, activated=fullscreen_viewer.next_image)
-            QShortcut(QKeySequence(self.config.get_shortcut("previous_image")), 
+            QShortcut(self.config.get_key_sequence("previous_image"), 
                      fullscreen_viewer, activated=fullscreen_viewer.previous_image)
             
             # Image operations
-            QShortcut(QKeySequence(self.config.get_shortcut("rotate_image")), 
+            QShortcut(self.config.get_key_sequence("rotate_image"), 
                      fullscreen_viewer, activated=fullscreen_viewer.rotate_image)
-            QShortcut(QKeySequence(self.config.get_shortcut("mirror_image")), 
+            QShortcut(self.config.get_key_sequence("mirror_image"), 
                      fullscreen_viewer, activated=fullscreen_viewer.toggle_mirror_mode)
-            QShortcut(QKeySequence(self.config.get_shortcut("toggle_fit")), 
+            QShortcut(self.config.get_key_sequence("toggle_fit"), 
                      fullscreen_viewer, activated=fullscreen_viewer.toggle_fit_mode)
             
             # Rating shortcuts
             for i in range(6):
-                QShortcut(QKeySequence(self.config.get_shortcut(f"rate_{i}")), 
-                         fullscreen_viewer, activated=lambda x=i: fullscreen_viewer.set_rating(x))
+                QShortcut(self.config.get_key_sequence(f"rate_{i}"), 
+                         fullscreen_viewer, activated=partial(fullscreen_viewer.set_rating, i))
                 
         except Exception as e:
             logger.error(f"Error setting up fullscreen shortcuts: {e}")
@@ -373,8 +564,8 @@ class GalleryShortcuts:
                 self.fullscreen_viewer = None
                 
                 # Sync grid view to last fullscreen position
-                if current_hash and hasattr(self.main_window, 'grid_view'):
-                    self.main_window.grid_view.select_by_hash(current_hash)
+                if current_hash and (grid_view := self._gv()) is not None:
+                    grid_view.select_by_hash(current_hash)
         except Exception as e:
             logger.error(f"Error exiting fullscreen view: {e}")
 
@@ -390,48 +581,30 @@ class ShortcutsDialog(QDialog):
         """Setup the dialog UI"""
         layout = QVBoxLayout(self)
         
-        # Style
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e1e;
-                color: white;
-            }
-            QLabel {
-                color: white;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 15px;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: #2997ff;
-            }
-        """)
-        
-        # Create sections
-        layout.addWidget(self.create_section("General Shortcuts", [
-            ("Space", "Toggle Fullscreen"),
-            ("Delete", "Delete Image"),
-            ("Left/Right", "Previous/Next Image"),
-            ("Up/Down", "Previous/Next Image"),
-            ("0-5", "Set Rating"),
-            ("Ctrl+O", "Open Folder")
-        ]))
-        
-        layout.addWidget(self.create_section("Fullscreen Shortcuts", [
-            ("Space/Esc", "Exit Fullscreen"),
-            ("N", "Show Tag Panel"),
-            ("R", "Rotate Image"),
-            ("M", "Mirror Image"),
-            ("F", "Toggle Fit Mode"),
-            ("Mouse Wheel", "Navigate Images"),
-            ("Ctrl+Wheel", "Zoom In/Out"),
-            ("Right Click", "Exit Fullscreen"),
-            ("Middle Click", "Enter Fullscreen")
-        ]))
+        self.setStyleSheet(_DIALOG_QSS)
+        
+        # Create sections, one tab each, built when first shown
+        layout.addWidget(_lazy_tab_widget([
+            ("General Shortcuts", [
+                ("Space", "Toggle Fullscreen"),
+                ("Delete", "Delete Image"),
+                ("Left/Right", "Previous/Next Image"),
+                ("Up/Down", "Previous/Next Image"),
+                ("0-5", "Set Rating"),
+                ("Ctrl+O", "Open Folder")
+            ]),
+            ("Fullscreen Shortcuts", [
+                ("Space/Esc", "Exit Fullscreen"),
+                ("N", "Show Tag Panel"),
+                ("R", "Rotate Image"),
+                ("M", "Mirror Image"),
+                ("F", "Toggle Fit Mode"),
+                ("Mouse Wheel", "Navigate Images"),
+                ("Ctrl+Wheel", "Zoom In/Out"),
+                ("Right Click", "Exit Fullscreen"),
+                ("Middle Click", "Enter Fullscreen")
+            ]),
+        ], self.create_section))
         
         # Close button
         close_btn = QPushButton("Close")
@@ -441,27 +614,12 @@ class ShortcutsDialog(QDialog):
     def create_section(self, title: str, shortcuts: list[tuple[str, str]]) -> QGroupBox:
         """Create a section of shortcuts"""
         group = QGroupBox(title)
-        group.setStyleSheet("""
-            QGroupBox {
-                color: white;
-                border: 1px solid #555555;
-                border-radius: 5px;
-                margin-top: 1em;
-                padding-top: 1em;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
-        
         layout = QVBoxLayout(group)
         
         for key, description in shortcuts:
             row = QHBoxLayout()
             key_label = QLabel(f"<b>{key}</b>")
-            key_label.setStyleSheet("color: #2997ff;")
+            key_label.setObjectName("shortcutKey")
             row.addWidget(key_label)
             row.addWidget(QLabel(description))
             row.addStretch()
@@ -475,6 +633,7 @@ class ShortcutCustomizeDialog(QDialog):
     def __init__(self, shortcut_manager: GalleryShortcuts, parent: Optional[QDialog] = None):
         super().__init__(parent)
         self.shortcut_manager = shortcut_manager
+        self._edits: list[tuple[str, QLineEdit]] = []  # Editors of built sections
         self.setWindowTitle("Customize Shortcuts")
         self.setup_ui()
         
@@ -482,70 +641,34 @@ class ShortcutCustomizeDialog(QDialog):
         """Setup the dialog UI"""
         layout = QVBoxLayout(self)
         
-        # Style
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e1e;
-                color: white;
-                min-width: 500px;
-            }
-            QLabel {
-                color: white;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 15px;
-                color: white;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #2997ff;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-            }
-            QLineEdit {
-                background-color: #2d2d2d;
-                color: white;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-            }
-            QLineEdit:focus {
-                border-color: #0078d4;
-            }
-        """)
-        
-        # Add sections
-        layout.addWidget(self.create_shortcut_section("Navigation", [
-            ("previous_image", "Previous Image"),
-            ("next_image", "Next Image"),
-            ("move_up", "Move Up"),
-            ("move_down", "Move Down")
-        ]))
-        
-        layout.addWidget(self.create_shortcut_section("View Modes", [
-            ("toggle_fullscreen", "Toggle Fullscreen"),
-            ("exit_fullscreen", "Exit Fullscreen")
-        ]))
-        
-        layout.addWidget(self.create_shortcut_section("Image Operations", [
-            ("rotate_image", "Rotate Image"),
-            ("mirror_image", "Mirror Image"),
-            ("toggle_fit", "Toggle Fit"),
-            ("delete_image", "Delete Image")
-        ]))
-        
-        layout.addWidget(self.create_shortcut_section("Ratings", [
-            (f"rate_{i}", f"Rate {i} Stars") for i in range(6)
-        ]))
-        
-        layout.addWidget(self.create_shortcut_section("File Operations", [
-            ("open_folder", "Open Folder"),
-            ("save_changes", "Save Changes")
-        ]))
+        self.setStyleSheet(_CUSTOMIZE_QSS)
+        
+        # Add sections, one tab each, built when first shown
+        layout.addWidget(_lazy_tab_widget([
+            ("Navigation", [
+                ("previous_image", "Previous Image"),
+                ("next_image", "Next Image"),
+                ("move_up", "Move Up"),
+                ("move_down", "Move Down")
+            ]),
+            ("View Modes", [
+                ("toggle_fullscreen", "Toggle Fullscreen"),
+                ("exit_fullscreen", "Exit Fullscreen")
+            ]),
+            ("Image Operations", [
+                ("rotate_image", "Rotate Image"),
+                ("mirror_image", "Mirror Image"),
+                ("toggle_fit", "Toggle Fit"),
+                ("delete_image", "Delete Image")
+            ]),
+            ("Ratings", [
+                (f"rate_{i}", f"Rate {i} Stars") for i in range(6)
+            ]),
+            ("File Operations", [
+                ("open_folder", "Open Folder"),
+                ("save_changes", "Save Changes")
+            ]),
+        ], self.create_shortcut_section))
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -565,21 +688,6 @@ class ShortcutCustomizeDialog(QDialog):
     def create_shortcut_section(self, title: str, shortcuts: list[tuple[str, str]]) -> QGroupBox:
         """Create a section of shortcut settings"""
         group = QGroupBox(title)
-        group.setStyleSheet("""
-            QGroupBox {
-                color: white;
-                border: 1px solid #555555;
-                border-radius: 5px;
-                margin-top: 1em;
-                padding-top: 1em;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
-        
         layout = QVBoxLayout(group)
         
         for action, description in shortcuts:
@@ -594,6 +702,7 @@ class ShortcutCustomizeDialog(QDialog):
             shortcut_edit.setReadOnly(True)
             shortcut_edit.focusInEvent = lambda e, a=action, edit=shortcut_edit: self.start_shortcut_capture(a, edit)
             row.addWidget(shortcut_edit)
+            self._edits.append((action, shortcut_edit))
             
             # Reset button
             reset_btn = QPushButton("Reset")
@@ -640,9 +749,16 @@ class ShortcutCustomizeDialog(QDialog):
     def reset_all_shortcuts(self) -> None:
         """Reset all shortcuts to defaults"""
         try:
-            self.shortcut_manager.config.reset_to_default()
-            self.accept()  # Close dialog
-            ShortcutCustomizeDialog(self.shortcut_manager, self.parent()).exec()  # Reopen with defaults
+            config = self.shortcut_manager.config
+            config.reset_to_default()
+            
+            # Rebind live shortcuts, including those on tabs not built yet
+            for action in list(self.shortcut_manager.shortcuts):
+                self.shortcut_manager.update_shortcut(action, config.get_shortcut(action))
+                
+            # Refresh editors in place; unbuilt tabs read the defaults when shown
+            for action, edit in self._edits:
+                edit.setText(config.get_shortcut(action))
         except Exception as e:
             logger.error(f"Error resetting all shortcuts: {e}")
 
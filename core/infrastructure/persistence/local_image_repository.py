@@ -1,16 +1,17 @@
 import os
-from typing import List, Optional, Dict, Any, Set
+from typing import Iterator, List, Optional, Dict, Any, Set
 import logging
 from pathlib import Path
 import json
-from datetime import datetime
 
 from core.domain.repositories.image_repository import ImageRepository
 from core.domain.entities.image import Image
 from core.domain.entities.image_status import ImageStatus
 from core.domain.specifications.image_specifications import ImageSpecification
 from core.domain.entities.image_metadata import ImageMetadata
+from core.domain.entities.image_catalog import ImageCatalog
 from ...infrastructure.config.app_config import AppConfig
+from ...infrastructure.config.constants import IMAGE_EXTENSIONS
 from ...infrastructure.utils.image_utils import open_image_efficient, get_image_dimensions
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,8 @@ class LocalImageRepository(ImageRepository):
             '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'
         }
         self.base_directory = config.get_images_dir()
+        # Last raw extension that matched; folders are usually homogeneous
+        self._last_ext: Optional[str] = None
         self._metadata_cache: Dict[str, Dict[str, Any]] = {}
         
     def get_by_path(self, path: str) -> Optional[Image]:
@@ -41,8 +44,8 @@ class LocalImageRepository(ImageRepository):
                 height=0,  # Will be filled when needed
                 format=os.path.splitext(path)[1][1:],
                 size_bytes=stats.st_size,
-                created_at=datetime.fromtimestamp(stats.st_ctime),
-                modified_at=datetime.fromtimestamp(stats.st_mtime)
+                ctime=stats.st_ctime,
+                mtime=stats.st_mtime
             )
             
             # Add cached metadata if available
@@ -96,45 +99,7 @@ class LocalImageRepository(ImageRepository):
     def list_images(self, directory: str, include_subfolders: bool = False) -> List[Image]:
         """List all images in a directory"""
         try:
-            images = []
-            if isinstance(directory, tuple):
-                # Handle case where directory is passed as tuple
-                directory = directory[0]
-                
-            directory_path = Path(directory)
-            
-            logger.debug(f"Scanning directory: {directory} (include_subfolders: {include_subfolders})")
-            logger.debug(f"Supported extensions: {self.supported_extensions}")
-            
-            if not directory_path.exists():
-                logger.error(f"Directory does not exist: {directory}")
-                return []
-                
-            # Function to process a single directory
-            def process_directory(dir_path: Path) -> None:
-                try:
-                    entries = list(dir_path.iterdir())
-                    logger.debug(f"Found {len(entries)} entries in {dir_path}")
-                    
-                    for entry in entries:
-                        if entry.is_file() and entry.suffix.lower() in self.supported_extensions:
-                            logger.debug(f"Found supported image file: {entry}")
-                            if image := self._load_image(entry):
-                                logger.debug(f"Successfully loaded image: {entry}")
-                                images.append(image)
-                            else:
-                                logger.warning(f"Failed to load image: {entry}")
-                        elif include_subfolders and entry.is_dir():
-                            logger.debug(f"Processing subdirectory: {entry}")
-                            process_directory(entry)
-                        else:
-                            logger.debug(f"Skipping non-image entry: {entry}")
-                except Exception as e:
-                    logger.error(f"Error processing directory {dir_path}: {e}")
-            
-            # Start processing from the root directory
-            process_directory(directory_path)
-            
+            images = list(self.iter_images(directory, include_subfolders))
             logger.debug(f"Found {len(images)} valid images in {directory}")
             return images
             
@@ -142,25 +107,81 @@ class LocalImageRepository(ImageRepository):
             logger.error(f"Error loading directory {directory}: {e}", exc_info=True)
             return []
             
-    def find(self, specification: ImageSpecification) -> List[Image]:
-        """Find images matching a specification"""
+    def iter_images(self, directory: str, include_subfolders: bool = False) -> Iterator[Image]:
+        """Yield images in a directory as the scan reaches them"""
+        if isinstance(directory, tuple):
+            # Handle case where directory is passed as tuple
+            directory = directory[0]
+            
+        directory_path = Path(directory)
+        
+        logger.debug(f"Scanning directory: {directory} (include_subfolders: {include_subfolders})")
+        logger.debug(f"Supported extensions: {self.supported_extensions}")
+        
+        if not directory_path.exists():
+            logger.error(f"Directory does not exist: {directory}")
+            return
+            
+        yield from self._iter_directory(directory_path, include_subfolders)
+        
+    def _iter_directory(self, dir_path: Path, include_subfolders: bool) -> Iterator[Image]:
+        """Yield images from a single directory, descending into subfolders if requested"""
         try:
-            # Get all images in base directory
-            all_images = []
-            for root, _, files in os.walk(self.base_directory):
-                for file in files:
-                    if self._is_image_file(file):
-                        path = os.path.join(root, file)
-                        if image := self.get_by_path(path):
-                            all_images.append(image)
-            
-            # Filter by specification
-            return [img for img in all_images if specification.is_satisfied_by(img)]
+            # scandir entries carry the file type, and on Windows the stat
+            # result, from the directory read itself
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+            logger.debug(f"Found {len(entries)} entries in {dir_path}")
+            
+            for entry in entries:
+                if entry.is_file() and self._is_supported(entry.name):
+                    logger.debug(f"Found supported image file: {entry.path}")
+                    if image := self._load_image(Path(entry.path), entry.stat()):
+                        logger.debug(f"Successfully loaded image: {entry.path}")
+                        yield image
+                    else:
+                        logger.warning(f"Failed to load image: {entry.path}")
+                elif include_subfolders and entry.is_dir():
+                    logger.debug(f"Processing subdirectory: {entry.path}")
+                    yield from self._iter_directory(Path(entry.path), include_subfolders)
+                else:
+                    logger.debug(f"Skipping non-image entry: {entry.path}")
+        except Exception as e:
+            logger.error(f"Error processing directory {dir_path}: {e}")
             
+    def find(self, specification: ImageSpecification) -> List[Image]:
+        """Find images in the base directory matching a specification
+        
+        The scan is loaded into an ImageCatalog and the specification is
+        evaluated as column masks, falling back per image only for nodes
+        without a vectorized mask (e.g. tags).
+        """
+        try:
+            catalog = ImageCatalog.from_images(list(self._iter_base_images()))
+            return catalog.to_images(catalog.find(specification))
         except Exception as e:
             logger.error(f"Error finding images: {e}")
             return []
             
+    def iter_find(self, specification: ImageSpecification) -> Iterator[Image]:
+        """Yield images in the base directory matching a specification"""
+        try:
+            matches = specification.compile()
+            for image in self._iter_base_images():
+                if matches(image):
+                    yield image
+                    
+        except Exception as e:
+            logger.error(f"Error finding images: {e}")
+            
+    def _iter_base_images(self) -> Iterator[Image]:
+        """Yield every image under the base directory"""
+        for root, _, files in os.walk(self.base_directory):
+            for file in files:
+                if self._is_image_file(file):
+                    if image := self.get_by_path(os.path.join(root, file)):
+                        yield image
+                        
     def update_rating(self, path: str, rating: int) -> bool:
         """Update rating for an image"""
         try:
@@ -172,6 +193,16 @@ class LocalImageRepository(ImageRepository):
             logger.error(f"Error updating rating for {path}: {e}")
             return False
             
+    def bulk_update_ratings(self, ratings: Dict[str, int]) -> Dict[str, bool]:
+        """Update ratings for multiple images in a single pass"""
+        try:
+            for path, rating in ratings.items():
+                self._metadata_cache.setdefault(path, {})['rating'] = rating
+            return dict.fromkeys(ratings, True)
+        except Exception as e:
+            logger.error(f"Error updating ratings for {len(ratings)} images: {e}")
+            return dict.fromkeys(ratings, False)
+            
     def update_status(self, path: str, status: ImageStatus) -> bool:
         """Update status for an image"""
         try:
@@ -243,15 +274,22 @@ class LocalImageRepository(ImageRepository):
         except Exception:
             return False
             
-    def _load_image(self, path: Path) -> Optional[Image]:
-        """Load image and extract metadata"""
+    def _load_image(self, path: Path, stats: Optional[os.stat_result] = None) -> Optional[Image]:
+        """Load image and extract metadata
+        
+        Args:
+            path: Image file path
+            stats: Stat result already at hand (e.g. from os.scandir)
+        """
         try:
             logger.debug(f"Attempting to load image: {path}")
             
             # First verify the file exists and is readable
-            if not path.exists():
-                logger.error(f"Image file does not exist: {path}")
-                return None
+            if stats is None:
+                if not path.exists():
+                    logger.error(f"Image file does not exist: {path}")
+                    return None
+                stats = path.stat()
             
             if not os.access(path, os.R_OK):
                 logger.error(f"Image file is not readable: {path}")
@@ -273,9 +311,9 @@ class LocalImageRepository(ImageRepository):
                     width=width,
                     height=height,
                     format=path.suffix[1:],
-                    size_bytes=path.stat().st_size,
-                    created_at=datetime.fromtimestamp(path.stat().st_ctime),
-                    modified_at=datetime.fromtimestamp(path.stat().st_mtime)
+                    size_bytes=stats.st_size,
+                    ctime=stats.st_ctime,
+                    mtime=stats.st_mtime
                 )
                 
                 # Extract InvokeAI metadata if available
@@ -328,8 +366,22 @@ class LocalImageRepository(ImageRepository):
             logger.error(f"Error validating image entity: {e}")
             return False
         
+    def _is_supported(self, filename: str) -> bool:
+        """Check a directory entry against supported_extensions
+        
+        The last matching extension is checked first, as it is in its
+        original case, so runs of same-format files skip lower() and the
+        set lookup.
+        """
+        ext = os.path.splitext(filename)[1]
+        if ext == self._last_ext:
+            return True
+        if ext.lower() in self.supported_extensions:
+            self._last_ext = ext
+            return True
+        return False
+        
     @staticmethod
     def _is_image_file(filename: str) -> bool:
         """Check if file is an image based on extension"""
-        extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-        return os.path.splitext(filename)[1].lower() in extensions 
\ No newline at end of file
+        return os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS 
\ No newline at end of file
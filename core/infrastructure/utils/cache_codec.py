@@ -0,0 +1,44 @@
+"""Binary encoding for cache files that are only read back by the app
+
+MessagePack is used when installed; otherwise entries stay JSON. The file
+suffix follows the encoding, so caches written by either setup are never
+misread, and LEGACY_SUFFIX files can be migrated on first read.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from .json_utils import json_loads, json_dumps
+
+try:
+    import msgpack
+except ImportError:  # Optional; caches fall back to JSON files
+    msgpack = None
+
+# Suffix for cache files written by encode()
+CACHE_SUFFIX = '.msgpack' if msgpack else '.json'
+
+# Suffix of cache files written before MessagePack was available
+LEGACY_SUFFIX = '.json'
+
+def _default(obj: Any) -> Any:
+    """Encode values msgpack has no native type for"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def encode(obj: Any) -> bytes:
+    """Serialize a cache entry"""
+    if msgpack:
+        return msgpack.packb(obj, use_bin_type=True, default=_default)
+    return json_dumps(obj)
+
+def decode(data: bytes) -> Any:
+    """Deserialize a cache entry written by encode()"""
+    if msgpack:
+        return msgpack.unpackb(data, raw=False)
+    return json_loads(data)
+
+def decode_legacy(data: bytes) -> Any:
+    """Deserialize a cache entry written as JSON"""
+    return json_loads(data)
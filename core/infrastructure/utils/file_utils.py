@@ -0,0 +1,31 @@
+"""Filesystem helpers"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes, fsync: bool = True) -> None:
+    """Replace a file's contents so readers see either the old or new version
+
+    The data goes to a temporary file in the same directory, which is then
+    renamed over the target with os.replace (atomic on POSIX and Windows).
+    A crash mid-write leaves the previous file intact.
+
+    Args:
+        path: File to write
+        data: New contents
+        fsync: Flush the data to disk before the rename
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
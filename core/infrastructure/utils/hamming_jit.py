@@ -0,0 +1,46 @@
+"""Numba-compiled Hamming distance kernels for hashes packed into 64-bit words
+
+Importing this module requires numba; callers should import it lazily and
+fall back to the numpy implementation when it is unavailable.
+"""
+
+import numpy as np
+from numba import njit, prange, types
+from numba.extending import intrinsic
+
+@intrinsic
+def _popcount(typingctx, value):
+    """Count set bits using LLVM's ctpop intrinsic (hardware POPCNT)"""
+    if value != types.uint64:
+        return None
+
+    def codegen(context, builder, signature, args):
+        return builder.ctpop(args[0])
+
+    return types.uint64(types.uint64), codegen
+
+@njit(parallel=True, fastmath=True, cache=True)
+def hamming_matrix(words):
+    """Compute all-pairs Hamming distances between hashes packed into 64-bit words
+
+    Rows are XORed and popcounted word by word, so no (N, N, W) intermediate
+    is materialized.
+
+    Args:
+        words: uint64 array of shape (N, W); 8x8 hashes use W=1
+
+    Returns:
+        uint16 array of shape (N, N) with bit distances
+    """
+    n, width = words.shape
+    out = np.zeros((n, n), dtype=np.uint16)
+    for i in prange(n):
+        for j in range(i + 1, n):
+            # Match the popcount type; an int64 accumulator plus uint64
+            # would promote every add to float64
+            distance = np.uint64(0)
+            for w in range(width):
+                distance += _popcount(words[i, w] ^ words[j, w])
+            out[i, j] = distance
+            out[j, i] = distance
+    return out
@@ -1,6 +1,12 @@
 """Utility module for image handling and PIL configuration"""
 
+import os
 import logging
+import shutil
+import struct
+import tempfile
+import zlib
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 from pathlib import Path
 from PIL import Image, ImageFile
@@ -12,12 +18,32 @@ Image.warnings.simplefilter('ignore')  # Suppress PIL warnings
 
 logger = logging.getLogger(__name__)
 
-def open_image_efficient(image_path: str, draft_size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG chunk types carrying keyword/text pairs
+PNG_TEXT_CHUNKS = (b'tEXt', b'iTXt', b'zTXt')
+
+# Bytes read up front when sniffing dimensions from a file header
+HEADER_PROBE_SIZE = 32
+
+# JPEG start-of-frame markers (SOF0..SOF15 minus DHT, JPG and DAC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+def open_image_efficient(image_path: str,
+                         draft_size: Optional[Tuple[int, int]] = None,
+                         mode: str = 'RGB') -> Optional[Image.Image]:
     """Open an image efficiently using PIL's draft mode if size is provided
     
+    For JPEGs, draft mode lets libjpeg scale the IDCT down by up to 8x and,
+    with mode 'L', decode only the luma plane. Other formats ignore it.
+    
     Args:
         image_path: Path to the image file
         draft_size: Optional target size for draft mode
+        mode: Pixel mode requested from the decoder in draft mode
         
     Returns:
         PIL Image object or None if opening fails
@@ -29,7 +55,7 @@ def open_image_efficient(image_path: str, draft_size: Optional[Tuple[int, int]]
         # Use draft mode if size provided
         if draft_size is not None:
             try:
-                img.draft('RGB', draft_size)
+                img.draft(mode, draft_size)
             except Exception as e:
                 logger.warning(f"Draft mode failed for {image_path}: {e}")
         
@@ -41,10 +67,45 @@ def open_image_efficient(image_path: str, draft_size: Optional[Tuple[int, int]]
         logger.error(f"Error opening image {image_path}: {e}", exc_info=True)
         return None
 
+def render_thumbnail(image_path: str,
+                     output_path: str,
+                     max_size: Tuple[int, int],
+                     draft_size: Optional[Tuple[int, int]] = None) -> bool:
+    """Decode, downscale and save a thumbnail as an optimized JPEG
+    
+    Kept at module level with picklable arguments so it can run in a
+    worker process.
+    
+    Args:
+        image_path: Path to the source image
+        output_path: Path to write the thumbnail to
+        max_size: Bounding box for the thumbnail
+        draft_size: Optional target size for draft mode
+        
+    Returns:
+        True if the thumbnail was written, False otherwise
+    """
+    try:
+        img = open_image_efficient(image_path, draft_size)
+        if img is None:
+            return False
+            
+        with img:
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+            return save_image_optimized(img, Path(output_path))
+            
+    except Exception as e:
+        logger.error(f"Error rendering thumbnail for {image_path}: {e}", exc_info=True)
+        return False
+
 def get_image_dimensions(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
     """
     Get image dimensions efficiently without loading the full image.
     
+    PNG, JPEG, WebP, GIF and BMP sizes are parsed straight from the file
+    header; other formats fall back to PIL. Results are cached per
+    (path, mtime) so rescans of unchanged files skip the read.
+    
     Args:
         path: Path to the image file
         
@@ -52,14 +113,80 @@ def get_image_dimensions(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
         Tuple of (width, height) or None if failed
     """
     try:
-        with open(str(path), 'rb') as f:
-            img = Image.open(f)
-            img.draft('RGB', img.size)  # Use draft mode for efficiency
-            return img.size
+        path = os.fspath(path)
+        return _cached_dimensions(path, os.stat(path).st_mtime_ns)
     except Exception as e:
         logger.error(f"Error getting image dimensions for {path}: {e}")
         return None
 
+@lru_cache(maxsize=65536)
+def _cached_dimensions(path: str, mtime_ns: int) -> Tuple[int, int]:
+    """Read dimensions for a file version (mtime_ns is part of the cache key)"""
+    with open(path, 'rb') as f:
+        if dims := _dims_from_header(f):
+            return dims
+        f.seek(0)
+        with Image.open(f) as img:
+            return img.size
+
+def _dims_from_header(f) -> Optional[Tuple[int, int]]:
+    """Parse dimensions from the header of common formats"""
+    head = f.read(HEADER_PROBE_SIZE)
+    if head.startswith(PNG_SIGNATURE) and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    if head.startswith(b'\xff\xd8'):
+        f.seek(2)
+        return _jpeg_dims(f)
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return _webp_dims(head)
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', head[6:10])
+    if head[:2] == b'BM' and len(head) >= 26:
+        width, height = struct.unpack('<ii', head[18:26])
+        return width, abs(height)  # Negative height means top-down rows
+    return None
+
+def _jpeg_dims(f) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segments up to the first start-of-frame marker"""
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # Fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        segment = f.read(2)
+        if len(segment) < 2:
+            return None
+        length, = struct.unpack('>H', segment)
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>xHH', frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+def _webp_dims(head: bytes) -> Optional[Tuple[int, int]]:
+    """Parse dimensions from the first WebP chunk"""
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L' and head[20] == 0x2f:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
 def convert_to_rgb(img: Image.Image) -> Image.Image:
     """
     Convert image to RGB mode efficiently.
@@ -108,4 +235,67 @@ def save_image_optimized(img: Image.Image, output_path: Path, quality: int = 85)
         
     except Exception as e:
         logger.error(f"Error saving image to {output_path}: {e}", exc_info=True)
-        return False 
\ No newline at end of file
+        return False
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Encode a PNG chunk with its length and CRC"""
+    crc = zlib.crc32(chunk_type + data) & 0xffffffff
+    return struct.pack('>I4s', len(data), chunk_type) + data + struct.pack('>I', crc)
+
+def rewrite_png_text_chunk(path: Union[str, Path], key: str, value: str) -> bool:
+    """Replace a PNG text entry by streaming chunks, without re-encoding pixels
+    
+    Any existing text chunks for key are dropped and a single uncompressed
+    iTXt chunk is written ahead of the first IDAT. The file is replaced
+    atomically.
+    
+    Args:
+        path: Path to the PNG file
+        key: Text keyword (e.g. 'invokeai_metadata')
+        value: Text to store
+        
+    Returns:
+        True if the file was rewritten, False otherwise
+    """
+    path = Path(path)
+    keyword = key.encode('latin-1')
+    # iTXt: keyword, compression flag/method, empty language and translated keyword
+    new_chunk = _png_chunk(b'iTXt', keyword + b'\0\0\0\0\0' + value.encode('utf-8'))
+    
+    tmp_path = None
+    try:
+        with open(path, 'rb') as src:
+            if src.read(8) != PNG_SIGNATURE:
+                logger.error(f"Not a PNG file: {path}")
+                return False
+                
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as dst:
+                tmp_path = dst.name
+                dst.write(PNG_SIGNATURE)
+                written = False
+                
+                while header := src.read(8):
+                    length, chunk_type = struct.unpack('>I4s', header)
+                    body = src.read(length + 4)  # Data plus CRC
+                    
+                    if chunk_type in PNG_TEXT_CHUNKS and body[:length].split(b'\0', 1)[0] == keyword:
+                        continue  # Replaced below
+                        
+                    if not written and chunk_type in (b'IDAT', b'IEND'):
+                        dst.write(new_chunk)
+                        written = True
+                        
+                    dst.write(header + body)
+                    if chunk_type == b'IEND':
+                        break
+                        
+        # The temp file is created 0600; keep the image's own permissions
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error rewriting PNG text chunk in {path}: {e}", exc_info=True)
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+        return False
@@ -0,0 +1,26 @@
+"""JSON encoding helpers that use orjson when it is installed"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder is used instead
+    orjson = None
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj: Any, indent: bool = False,
+               default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to UTF-8 JSON bytes
+
+    Args:
+        obj: Value to serialize
+        indent: Pretty-print with two-space indentation (for files users edit)
+        default: Converts values JSON has no type for (e.g. str for Path)
+    """
+    if orjson:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=default).encode('utf-8')
@@ -1,6 +1,7 @@
 """Utility functions for Qt image operations"""
 
 import logging
+import os
 from pathlib import Path
 from typing import Optional, Tuple, Union
 from PyQt6.QtGui import QImage
@@ -54,6 +55,29 @@ def scale_qimage(image: QImage, size: Tuple[int, int], keep_aspect: bool = True)
         logger.error(f"Error scaling image: {e}")
         return None
 
+def save_qimage(image: QImage, output_path: Union[str, Path], quality: int = 85) -> bool:
+    """
+    Save a QImage as JPEG, replacing any existing file atomically.
+    
+    Args:
+        image: Image to save
+        output_path: Destination path
+        quality: JPEG quality (0-100)
+        
+    Returns:
+        True if the file was written
+    """
+    tmp_path = f"{output_path}.tmp"
+    try:
+        if image.isNull() or not image.save(tmp_path, "JPG", quality):
+            return False
+        os.replace(tmp_path, output_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving image {output_path}: {e}")
+        Path(tmp_path).unlink(missing_ok=True)
+        return False
+
 def is_valid_qimage(image: Optional[QImage]) -> bool:
     """
     Check if a QImage is valid and usable.
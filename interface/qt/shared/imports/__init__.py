@@ -5,7 +5,7 @@ from .widgets import *
 from .gui import *
 
 # Constants
-IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
 DEFAULT_THUMBNAIL_SIZE = 200
 THUMBNAIL_PADDING = 10
 SCROLL_BAR_WIDTH = 15
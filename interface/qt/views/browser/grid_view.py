@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QScrollArea, QWidget, QGridLayout, QSizePolicy, QFra
 from PyQt6.QtGui import QImage, QKeyEvent
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThread, QObject
 from threading import Lock
+from itertools import islice
 import logging
 
 # Configure PIL logging to be less verbose
@@ -20,6 +21,12 @@ from core.domain.entities.image_hash import ImageHash
 
 logger = logging.getLogger(__name__)
 
+# Thumbnails beyond the viewport, in the scroll direction, to prefetch
+PREFETCH_AHEAD = 40
+
+# Quiet period after the last scroll step before prefetching
+PREFETCH_DEBOUNCE_MS = 50
+
 class DirectoryLoader(QThread):
     """Thread for loading directory contents"""
     loaded = pyqtSignal(list)  # Emits list of images when done
@@ -105,6 +112,12 @@ class GridView(BaseView):
         self._needs_reflow = False
         self._is_reflowing = False
         self._layout_lock = Lock()
+        self._columns = 1
+        self._last_scroll_value = 0
+        self._scrolling_down = True
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetch_ahead)
         
         # Setup context menu
         self.context_menu = ContextMenu(self)
@@ -131,6 +144,9 @@ class GridView(BaseView):
         self.image_loader.thumbnail_batch_ready.connect(self._on_batch_ready)
         self.image_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
         
+        # Prefetch thumbnails ahead of the viewport while scrolling
+        self.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        
     def _setup_context_menu(self):
         """Setup context menu callbacks"""
         self.context_menu.set_rating_callback(self._handle_context_rating)
@@ -321,6 +337,7 @@ class GridView(BaseView):
             thumbnail_width = next(iter(self.thumbnails.values())).width()
             spacing = self.grid_layout.spacing()
             columns = max(1, (container_width + spacing) // (thumbnail_width + spacing))
+            self._columns = columns
             
             # Reposition all thumbnails
             for idx, thumbnail in enumerate(self.thumbnails.values()):
@@ -338,6 +355,36 @@ class GridView(BaseView):
             logger.error(f"Error in reflow_layout: {e}")
             self._is_reflowing = False
             
+    def _on_scroll(self, value: int) -> None:
+        """Note the scroll direction and schedule a prefetch once scrolling pauses"""
+        self._scrolling_down = value >= self._last_scroll_value
+        self._last_scroll_value = value
+        self._prefetch_timer.start(PREFETCH_DEBOUNCE_MS)
+        
+    def _prefetch_ahead(self) -> None:
+        """Prefetch the thumbnails the viewport is moving towards"""
+        try:
+            if not self.thumbnails:
+                return
+                
+            value = self._last_scroll_value
+            
+            # Index range of rows currently visible
+            row_height = next(iter(self.thumbnails.values())).height() + self.grid_layout.spacing()
+            first_row = value // max(1, row_height)
+            last_row = (value + self.viewport().height()) // max(1, row_height)
+            
+            if self._scrolling_down:
+                start = (last_row + 1) * self._columns
+            else:
+                start = max(0, first_row * self._columns - PREFETCH_AHEAD)
+            paths = list(islice(self.thumbnails, start, start + PREFETCH_AHEAD))
+            if paths:
+                self.image_loader.prefetch_thumbnails(paths)
+                
+        except Exception as e:
+            logger.error(f"Error prefetching on scroll: {e}")
+            
     def _update_tab_order(self, columns: int) -> None:
         """Update tab order for thumbnails"""
         try:
@@ -3,7 +3,6 @@
 import logging
 from typing import Optional, List
 from pathlib import Path
-from datetime import datetime
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, 
@@ -119,8 +118,8 @@ class TagPanel(QWidget):
                 height=0,  # Will be filled when needed
                 format=path.suffix[1:].lower(),
                 size_bytes=stats.st_size,
-                created_at=datetime.fromtimestamp(stats.st_ctime),
-                modified_at=datetime.fromtimestamp(stats.st_mtime)
+                ctime=stats.st_ctime,
+                mtime=stats.st_mtime
             )
             image = Image(
                 path=str(path),
@@ -229,8 +229,8 @@ class InfoPanel(QWidget):
                 height=size.height(),
                 format=format_name,
                 size_bytes=stats.st_size,
-                created_at=datetime.fromtimestamp(stats.st_ctime),
-                modified_at=datetime.fromtimestamp(stats.st_mtime)
+                ctime=stats.st_ctime,
+                mtime=stats.st_mtime
             )
             
             # Create Image entity